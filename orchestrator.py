@@ -15,21 +15,24 @@ Usage:
     python orchestrator.py
 """
 
+import re
 import sys
+import asyncio
 import logging
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-import yaml
 from dotenv import load_dotenv
 
 # Import phases
 # from phases.scan import scan_news  # Deprecated - now using Anthropic Web Search
 from phases.interrogate import interrogate
 from phases.generate import generate
-from phases.log import log_run
+from phases.log import log_run, load_recent_logs
 
 # Import services
 from services.publishing import publish
+from utils.yaml_cache import load_yaml_cached
 
 
 def setup_logging():
@@ -45,14 +48,84 @@ def setup_logging():
 
 def load_config(config_path: str = "config.yaml") -> dict:
     """Load configuration from YAML file."""
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml_cached(config_path)
 
 
 def load_coverage_manifest(manifest_path: str = "coverage_manifest.yaml") -> dict:
     """Load coverage manifest from YAML file."""
-    with open(manifest_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml_cached(manifest_path)
+
+
+# Markers of a failed conversation (in conversation_id) or errored exchange (in response)
+_INVALID_TRANSCRIPT_RE = re.compile(r"FAILED|\[ERROR")
+
+# Config keys that phases index directly (section, key)
+REQUIRED_CONFIG_KEYS = [
+    ("demeter_ai", "url"),
+    ("demeter_ai", "response_timeout_seconds"),
+    ("interaction_limits", "max_conversations_per_run"),
+    ("interaction_limits", "max_exchanges_per_conversation"),
+]
+
+
+def validate_config(config: dict, coverage_manifest: dict) -> None:
+    """
+    Validate config and coverage manifest up front, before any phase runs.
+
+    Raises:
+        ValueError: If either file is not a mapping or required config keys are missing
+    """
+    if not isinstance(config, dict):
+        raise ValueError("config.yaml must contain a mapping")
+    if not isinstance(coverage_manifest, dict):
+        raise ValueError("coverage_manifest.yaml must contain a mapping")
+
+    missing = [
+        f"{section}.{key}"
+        for section, key in REQUIRED_CONFIG_KEYS
+        if key not in (config.get(section) or {})
+    ]
+    if missing:
+        raise ValueError(f"config.yaml is missing required keys: {', '.join(missing)}")
+
+
+async def _setup() -> tuple:
+    """
+    Load config, coverage manifest and recent logs with overlapping I/O.
+
+    Config and manifest load in parallel; recent logs depend on config so
+    they load in a second wave.
+
+    Returns:
+        (config, coverage_manifest, recent_logs)
+    """
+    config, coverage_manifest = await asyncio.gather(
+        asyncio.to_thread(load_config),
+        asyncio.to_thread(load_coverage_manifest)
+    )
+    validate_config(config, coverage_manifest)
+
+    recent_logs = await asyncio.to_thread(load_recent_logs, config, 7)
+    return config, coverage_manifest, recent_logs
+
+
+def _is_valid_transcript(transcript: dict) -> bool:
+    """Check whether a transcript completed and got a real first response."""
+    exchanges = transcript.get("exchanges")
+    if not exchanges:
+        return False
+    return not (
+        _INVALID_TRANSCRIPT_RE.search(transcript.get("conversation_id", ""))
+        or _INVALID_TRANSCRIPT_RE.search(str(exchanges[0].get("response", "")))
+    )
+
+
+async def _call_api(api, call):
+    """Await a ClaudeAPI call, then close the client it opened on this event loop."""
+    try:
+        return await call
+    finally:
+        await api.close()
 
 
 def main():
@@ -71,26 +144,21 @@ def main():
     logger.info(f"Run ID: {run_id}")
 
     try:
-        # Load configuration
+        # Load configuration and recent logs for context
         logger.info("\n[SETUP] Loading configuration...")
-        config = load_config()
-        coverage_manifest = load_coverage_manifest()
+        config, coverage_manifest, recent_logs = asyncio.run(_setup())
         logger.info("Configuration loaded successfully")
 
-        # Load recent logs for context
-        from phases.log import load_recent_logs
-        recent_logs = load_recent_logs(config, num_recent=7)
-        recent_topics = [
-            t.get('topic', '')
+        # Older logs embed full transcripts instead of a topics list
+        recent_topics = list(filter(None, chain.from_iterable(
+            log.get('topics', (t.get('topic') for t in log.get('transcripts', ())))
             for log in recent_logs
-            for t in log.get('transcripts', [])
-            if t.get('topic')
-        ]
+        )))
 
         # PHASE 1: Generate conversation plans with Claude API (web search enabled)
         logger.info("\n[PHASE 1] Generating conversation plans with web search...")
         from services.claude_api import ClaudeAPI
-        api = ClaudeAPI()
+        api = ClaudeAPI(max_retries=config.get("claude_api", {}).get("max_retries", 5))
         num_conversations = min(
             config.get('interaction_limits', {}).get('max_conversations_per_run', 5),
             config.get('output', {}).get('daily_minimum', {}).get('linkedin', 1) +
@@ -98,13 +166,14 @@ def main():
         )
 
         # Note: scan_results parameter is now deprecated - Claude uses web search instead
-        conversation_plans = api.generate_questions(
+        conversation_plans = asyncio.run(_call_api(api, api.generate_questions(
             config=config,
             coverage_manifest=coverage_manifest,
             scan_results=[],  # Empty - Claude will search the web autonomously
             recent_topics=recent_topics,
-            num_conversations=num_conversations
-        )
+            num_conversations=num_conversations,
+            model=config.get("claude_api", {}).get("models", {}).get("model_simple", "claude-haiku-4-5-20251001")
+        )))
         logger.info(f"Generated {len(conversation_plans)} conversation plans")
 
         # PHASE 2: Interrogate Demeter AI
@@ -113,17 +182,26 @@ def main():
         logger.info(f"Interrogation complete: {len(transcripts)} conversations")
 
         # Check if we got any valid responses
-        if not transcripts or all(
-            "FAILED" in t.get("conversation_id", "") or
-            "[ERROR" in str(t.get("exchanges", [{}])[0].get("response", ""))
-            for t in transcripts
-        ):
+        if not any(map(_is_valid_transcript, transcripts)):
             logger.warning("No valid transcripts obtained. Skipping content generation.")
             return
 
         # PHASE 2.5: Assess response quality
         logger.info("\n[PHASE 2.5] Assessing response quality...")
-        assessments = api.assess_responses(transcripts)
+        # Large unattended runs can use the (cheaper, slower) Message Batches API
+        batch_config = config.get("claude_api", {}).get("assessment_batch", {})
+        if batch_config.get("enabled", False) and len(transcripts) >= batch_config.get("min_transcripts", 5):
+            assessment_call = api.assess_responses_batch(
+                transcripts,
+                poll_interval=batch_config.get("poll_interval_seconds", 30),
+                max_wait=batch_config.get("max_wait_seconds", 3600)
+            )
+        else:
+            assessment_call = api.assess_responses(
+                transcripts,
+                max_concurrent=config.get("claude_api", {}).get("max_concurrent", 3)
+            )
+        assessments = asyncio.run(_call_api(api, assessment_call))
         logger.info(f"Assessment complete: {assessments.get('summary', {}).get('high_quality', 0)} high-quality conversations")
 
         # PHASE 3: Generate content
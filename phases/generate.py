@@ -5,8 +5,12 @@ Uses Claude API to turn Demeter AI conversation transcripts into
 channel-ready posts with chart specifications.
 """
 
+import asyncio
 import logging
-from typing import List, Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 from services.claude_api import ClaudeAPI
@@ -15,6 +19,13 @@ from services.charts import generate_chart
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_prompt_template(prompt_path: Path) -> str:
+    """Read a prompt template from disk (cached per path)."""
+    with open(prompt_path, 'r') as f:
+        return f.read()
+
+
 def generate(config: Dict, transcripts: List[Dict], run_id: str, assessments: Dict = None) -> List[Dict]:
     """
     Generate social media content from conversation transcripts.
@@ -37,67 +48,165 @@ def generate(config: Dict, transcripts: List[Dict], run_id: str, assessments: Di
     # Load the content writer prompt
     prompt_path = Path(__file__).parent.parent / "prompts" / "content_writer.txt"
     try:
-        with open(prompt_path, 'r') as f:
-            prompt_template = f.read()
+        prompt_template = _load_prompt_template(prompt_path)
     except FileNotFoundError:
         logger.error(f"Prompt template not found at {prompt_path}")
         raise
 
     # Initialize Claude API
-    api = ClaudeAPI()
-    model = config.get("claude_api", {}).get("models", {}).get("content_writing", "claude-sonnet-4-20250514")
+    api = ClaudeAPI(max_retries=config.get("claude_api", {}).get("max_retries", 5))
+    # Short, single-fact transcripts go to the cheaper model; content_writing is the pre-routing key
+    models = config.get("claude_api", {}).get("models", {})
+    model = models.get("model_complex", models.get("content_writing", "claude-sonnet-4-20250514"))
+    model_simple = models.get("model_simple")
 
     # Filter transcripts based on assessments (if available)
     transcripts_to_process = transcripts
     if assessments and 'assessments' in assessments:
-        # Only process high-quality conversations (overall_score >= 6)
-        assessment_map = {a['conversation_id']: a for a in assessments['assessments']}
+        # Only process conversations the assessor marked suitable for content
+        approved_ids = {
+            a['conversation_id'] for a in assessments['assessments']
+            if a.get('suitable_for_content', False)
+        }
         transcripts_to_process = [
             t for t in transcripts
-            if t.get('conversation_id') in assessment_map
-            and assessment_map[t['conversation_id']].get('suitable_for_content', False)
+            if t.get('conversation_id') in approved_ids
         ]
         logger.info(f"Filtered to {len(transcripts_to_process)} high-quality transcripts based on assessments")
 
+    # Call Claude API for all transcripts concurrently
+    max_concurrent = config.get("claude_api", {}).get("max_concurrent", 3)
+    batch_size = config.get("claude_api", {}).get("content_batch_size", 1)
+    results = asyncio.run(_generate_all(
+        api, transcripts_to_process, config, prompt_template, model, model_simple, max_concurrent, batch_size
+    ))
+
     all_posts = []
+    chart_jobs = []
 
-    # Process each transcript
-    for i, transcript in enumerate(transcripts_to_process):
-        logger.info(f"Generating content for transcript {i+1}/{len(transcripts)}: {transcript.get('topic', 'Unknown')}")
+    # Process posts from each result
+    for i, result in enumerate(results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to generate content for transcript {i+1}: {result}")
+            continue
 
-        try:
-            # Call Claude API to generate content
-            result = api.generate_content(
+        for j, post in enumerate(result.get("posts", [])):
+            # Queue chart rendering if spec is present
+            if "chart" in post and post["chart"]:
+                chart_jobs.append((len(all_posts), post["chart"], config, f"{run_id}_{i}_{j}"))
+
+            all_posts.append(post)
+
+    # Render all charts in one batch
+    if chart_jobs:
+        logger.info(f"Generating {len(chart_jobs)} charts")
+        for (post_index, _, _, _), (chart_path, error) in zip(chart_jobs, _render_charts(chart_jobs)):
+            if error:
+                logger.error(f"Failed to generate chart: {error}")
+            else:
+                logger.info(f"Chart saved to {chart_path}")
+            all_posts[post_index]["chart_path"] = chart_path
+
+    logger.info(f"Phase 3 complete: Generated {len(all_posts)} posts")
+    return all_posts
+
+
+async def _generate_all(
+    api: ClaudeAPI,
+    transcripts: List[Dict],
+    config: Dict,
+    prompt_template: str,
+    model: str,
+    model_simple: Optional[str],
+    max_concurrent: int,
+    batch_size: int = 1
+) -> List:
+    """
+    Generate content for every transcript, at most max_concurrent requests at a time.
+
+    With batch_size > 1, up to batch_size transcripts share each request
+    (see ClaudeAPI.generate_content_batch).
+
+    Returns:
+        Generated content per transcript, or the exception raised for that transcript
+    """
+    sem = asyncio.Semaphore(max_concurrent)
+
+    async def generate_one(i: int, transcript: Dict) -> List:
+        async with sem:
+            logger.info(f"Generating content for transcript {i+1}/{len(transcripts)}: {transcript.get('topic', 'Unknown')}")
+            return [await api.generate_content(
                 transcript=transcript,
                 config=config,
                 prompt_template=prompt_template,
-                model=model
+                model=model,
+                model_simple=model_simple
+            )]
+
+    async def generate_group(i: int, group: List[Dict]) -> List:
+        async with sem:
+            logger.info(f"Generating content for transcripts {i+1}-{i+len(group)}/{len(transcripts)}")
+            return await api.generate_content_batch(
+                transcripts=group,
+                config=config,
+                prompt_template=prompt_template,
+                model=model,
+                model_simple=model_simple
             )
 
-            # Process posts from the result
-            posts = result.get("posts", [])
-
-            for j, post in enumerate(posts):
-                # Generate chart if spec is present
-                if "chart" in post and post["chart"]:
-                    logger.info(f"Generating chart for post {j+1}")
-                    try:
-                        chart_path = generate_chart(
-                            chart_spec=post["chart"],
-                            config=config,
-                            output_name=f"{run_id}_{i}_{j}"
-                        )
-                        post["chart_path"] = chart_path
-                        logger.info(f"Chart saved to {chart_path}")
-                    except Exception as e:
-                        logger.error(f"Failed to generate chart: {e}")
-                        post["chart_path"] = None
-
-                all_posts.append(post)
+    if batch_size > 1:
+        groups = [(i, transcripts[i:i + batch_size]) for i in range(0, len(transcripts), batch_size)]
+        tasks = [generate_group(i, group) if len(group) > 1 else generate_one(i, group[0]) for i, group in groups]
+        sizes = [len(group) for _, group in groups]
+    else:
+        tasks = [generate_one(i, t) for i, t in enumerate(transcripts)]
+        sizes = [1] * len(transcripts)
+
+    try:
+        group_results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await api.close()
+
+    # A failed request fails every transcript in its group
+    results = []
+    for size, group_result in zip(sizes, group_results):
+        results.extend([group_result] * size if isinstance(group_result, BaseException) else group_result)
+    return results
+
+
+def _render_charts(chart_jobs: List[Tuple]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Render charts across worker processes.
+
+    Matplotlib rendering is CPU-bound, so a process pool gives true parallelism.
+    Falls back to rendering serially if the pool cannot be used (e.g. a chart
+    spec that can't be pickled, or process spawning unavailable).
 
+    Args:
+        chart_jobs: List of (post_index, chart_spec, config, output_name) tuples
+
+    Returns:
+        List of (chart_path, error) tuples in the same order as chart_jobs
+    """
+    if len(chart_jobs) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(chart_jobs), os.cpu_count() or 1)) as executor:
+                return list(executor.map(_render_chart_worker, chart_jobs))
         except Exception as e:
-            logger.error(f"Failed to generate content for transcript {i+1}: {e}")
-            continue
+            logger.warning(f"Parallel chart rendering failed ({e}), rendering serially")
 
-    logger.info(f"Phase 3 complete: Generated {len(all_posts)} posts")
-    return all_posts
+    return [_render_chart_worker(job) for job in chart_jobs]
+
+
+def _render_chart_worker(job: Tuple) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Render a single chart job. Top-level so it can run in a worker process.
+
+    Returns:
+        (chart_path, None) on success, (None, error message) on failure
+    """
+    _, chart_spec, config, output_name = job
+    try:
+        return generate_chart(chart_spec=chart_spec, config=config, output_name=output_name), None
+    except Exception as e:
+        return None, str(e)
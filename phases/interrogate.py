@@ -10,7 +10,7 @@ import logging
 from typing import List, Dict
 from datetime import datetime
 
-from services.browser import run_conversation
+from services.browser import launch_browser, run_conversation
 
 logger = logging.getLogger(__name__)
 
@@ -39,49 +39,96 @@ def interrogate(config: Dict, conversation_plans: List[Dict]) -> List[Dict]:
     timeout = config["demeter_ai"]["response_timeout_seconds"]
     max_conversations = config["interaction_limits"]["max_conversations_per_run"]
     max_exchanges = config["interaction_limits"]["max_exchanges_per_conversation"]
+    max_parallel = config["interaction_limits"].get("max_parallel_browsers", 3)
+    max_parallel_pages = config["interaction_limits"].get("max_parallel_pages", 4)
+    batch_size = config["interaction_limits"].get("question_batch_size", 1)
 
     # Limit to max conversations per run
     plans_to_run = conversation_plans[:max_conversations]
 
-    transcripts = []
-
-    for i, plan in enumerate(plans_to_run):
-        logger.info(f"Starting conversation {i+1}/{len(plans_to_run)}: {plan['topic']}")
-
-        # Prepare exchanges for this conversation
-        # Phase 0: just the opening question
-        # Phase 1+: opening question + follow-ups
+    # Prepare exchanges for each conversation
+    # Phase 0: just the opening question
+    # Phase 1+: opening question + follow-ups
+    plan_exchanges = []
+    for plan in plans_to_run:
         exchanges = [{"question": plan["opening_question"]}]
 
         # Add follow-ups if present (for Phase 1+)
+        # Plans can mark follow-ups as independent so they are asked concurrently
         if "follow_ups" in plan and plan["follow_ups"]:
+            independent = plan.get("independent_follow_ups", False)
             for follow_up in plan["follow_ups"][:max_exchanges-1]:
-                exchanges.append({"question": follow_up})
+                exchanges.append({"question": follow_up, "independent": independent})
 
-        # Run the conversation
-        try:
-            completed_exchanges = asyncio.run(run_conversation(url, exchanges, timeout))
+        plan_exchanges.append(exchanges)
 
-            transcript = {
-                "conversation_id": f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{i}",
-                "topic": plan["topic"],
-                "exchanges": completed_exchanges,
-                "timestamp": datetime.now().isoformat()
-            }
+    # Run all conversations concurrently in one shared browser
+    try:
+        results = asyncio.run(_run_all(plans_to_run, plan_exchanges, url, timeout, max_parallel, max_parallel_pages, batch_size))
+    except Exception as e:
+        # Browser failed to launch - every conversation fails with the same error
+        logger.error(f"Failed to launch browser: {e}")
+        results = [e] * len(plans_to_run)
 
-            transcripts.append(transcript)
-            logger.info(f"Completed conversation {i+1}: {len(completed_exchanges)} exchanges")
+    # One timestamp for the whole batch gives all transcripts from a run a coherent ID prefix
+    run_time = datetime.now()
+    ts_str = run_time.strftime('%Y%m%d_%H%M%S')
+    ts_iso = run_time.isoformat()
 
-        except Exception as e:
-            logger.error(f"Failed to complete conversation {i+1}: {e}")
+    transcripts = []
+
+    for i, (plan, result) in enumerate(zip(plans_to_run, results)):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to complete conversation {i+1}: {result}")
             # Add failed conversation with error
             transcripts.append({
-                "conversation_id": f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{i}_FAILED",
+                "conversation_id": f"conv_{ts_str}_{i}_FAILED",
                 "topic": plan["topic"],
-                "exchanges": [{"question": plan["opening_question"], "response": f"[FAILED: {str(e)}]"}],
-                "timestamp": datetime.now().isoformat(),
-                "error": str(e)
+                "exchanges": [{"question": plan["opening_question"], "response": f"[FAILED: {str(result)}]"}],
+                "timestamp": ts_iso,
+                "error": str(result)
             })
+            continue
+
+        transcripts.append({
+            "conversation_id": f"conv_{ts_str}_{i}",
+            "topic": plan["topic"],
+            "exchanges": result,
+            "timestamp": ts_iso
+        })
+        logger.info(f"Completed conversation {i+1}: {len(result)} exchanges")
 
     logger.info(f"Phase 2 complete: {len(transcripts)} conversations completed")
     return transcripts
+
+
+async def _run_all(
+    plans: List[Dict],
+    plan_exchanges: List[List[Dict]],
+    url: str,
+    timeout: int,
+    max_parallel: int,
+    max_parallel_pages: int,
+    batch_size: int
+) -> List:
+    """
+    Run every conversation against one shared browser, at most max_parallel at a time.
+
+    Returns:
+        Completed exchanges per plan, or the exception raised for that plan
+    """
+    sem = asyncio.Semaphore(max_parallel)
+
+    async with launch_browser() as browser:
+        async def run_one(i: int, plan: Dict, exchanges: List[Dict]) -> List[Dict]:
+            async with sem:
+                logger.info(f"Starting conversation {i+1}/{len(plans)}: {plan['topic']}")
+                return await run_conversation(
+                    url, exchanges, timeout, browser=browser,
+                    max_parallel_pages=max_parallel_pages, batch_size=batch_size
+                )
+
+        return await asyncio.gather(
+            *[run_one(i, plan, exchanges) for i, (plan, exchanges) in enumerate(zip(plans, plan_exchanges))],
+            return_exceptions=True
+        )
@@ -4,11 +4,15 @@ Phase 4: Logging and persistent state management.
 Writes run logs to JSON files and maintains persistent state across runs.
 """
 
-import json
+import heapq
 import logging
+import os
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,10 @@ def log_run(
     """
     Log a complete run to JSON file.
 
+    Transcripts, scan results and posts are written to JSONL sidecars
+    ({run_id}.{section}.jsonl) next to the main log, which records the
+    sidecar file names, topics covered and summary stats.
+
     Args:
         run_id: Unique run identifier
         config: Configuration dict
@@ -39,6 +47,21 @@ def log_run(
     """
     logger.info(f"Phase 4 (LOG): Writing run log for {run_id}")
 
+    posts_by_channel, posts_by_format = _count_posts(posts)
+
+    log_dir = Path(config.get("logging", {}).get("runs_dir", "logs/runs"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # Stream the large sections to JSONL sidecars so the main log stays small
+    section_files = {
+        section: _write_jsonl(log_dir / f"{run_id}.{section}.jsonl", items)
+        for section, items in (
+            ("scan_results", scan_results),
+            ("transcripts", transcripts),
+            ("posts", posts)
+        )
+    }
+
     # Prepare log data
     log_data = {
         "run_id": run_id,
@@ -48,48 +71,52 @@ def log_run(
             "active_experiment": config.get("active_experiment"),
             "interaction_limits": config.get("interaction_limits", {})
         },
-        "scan_results": scan_results,
-        "transcripts": transcripts,
+        "scan_results_file": section_files["scan_results"],
+        "transcripts_file": section_files["transcripts"],
+        "posts_file": section_files["posts"],
+        "topics": [t.get("topic") for t in transcripts if t.get("topic")],
         "assessments": assessments,
-        "posts": posts,
         "publishing_summary": publishing_summary,
         "stats": {
             "num_scans": len(scan_results),
             "num_conversations": len(transcripts),
             "num_posts": len(posts),
-            "posts_by_channel": _count_by_channel(posts),
-            "posts_by_format": _count_by_format(posts)
+            "posts_by_channel": posts_by_channel,
+            "posts_by_format": posts_by_format
         }
     }
 
     # Write to log file
-    log_dir = Path(config.get("logging", {}).get("runs_dir", "logs/runs"))
-    log_dir.mkdir(parents=True, exist_ok=True)
-
     log_file = log_dir / f"{run_id}.json"
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    # OPT_NON_STR_KEYS: non-string keys (e.g. None) become strings, as json.dump did
+    log_file.write_bytes(orjson.dumps(log_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     logger.info(f"Run log written to {log_file}")
     return str(log_file)
 
 
-def _count_by_channel(posts: List[Dict]) -> Dict[str, int]:
-    """Count posts by channel."""
-    counts = {}
-    for post in posts:
-        channel = post.get("channel", "unknown")
-        counts[channel] = counts.get(channel, 0) + 1
-    return counts
+def _write_jsonl(path: Path, items: List[Dict]) -> str:
+    """
+    Write items to a JSONL file, one serialized item at a time.
+
+    Returns:
+        File name of the JSONL file (relative to the runs directory)
+    """
+    with open(path, 'wb') as f:
+        for item in items:
+            f.write(orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS))
+            f.write(b"\n")
+    return path.name
 
 
-def _count_by_format(posts: List[Dict]) -> Dict[str, int]:
-    """Count posts by format type."""
-    counts = {}
+def _count_posts(posts: List[Dict]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Count posts by channel and by format type in a single pass."""
+    by_channel = Counter()
+    by_format = Counter()
     for post in posts:
-        format_type = post.get("format_type", "unknown")
-        counts[format_type] = counts.get(format_type, 0) + 1
-    return counts
+        by_channel[post.get("channel") or "unknown"] += 1
+        by_format[post.get("format_type") or "unknown"] += 1
+    return dict(by_channel), dict(by_format)
 
 
 def load_recent_logs(config: Dict, num_recent: int = 7) -> List[Dict]:
@@ -108,15 +135,18 @@ def load_recent_logs(config: Dict, num_recent: int = 7) -> List[Dict]:
     if not log_dir.exists():
         return []
 
-    # Get all log files sorted by modification time (most recent first)
-    log_files = sorted(log_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    # Get the most recently modified log files (most recent first).
+    # scandir entries cache their stat result, so each file is stat-ed at most once.
+    with os.scandir(log_dir) as it:
+        entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+    log_files = heapq.nlargest(num_recent, entries, key=lambda e: e.stat().st_mtime)
 
     recent_logs = []
-    for log_file in log_files[:num_recent]:
+    for log_file in log_files:
         try:
-            with open(log_file, 'r') as f:
-                recent_logs.append(json.load(f))
+            with open(log_file.path, 'rb') as f:
+                recent_logs.append(orjson.loads(f.read()))
         except Exception as e:
-            logger.warning(f"Could not load log {log_file}: {e}")
+            logger.warning(f"Could not load log {log_file.path}: {e}")
 
     return recent_logs
@@ -4,12 +4,26 @@ Phase 1: Scan for agricultural news and priority account activity.
 Uses DuckDuckGo search to find recent news relevant to Demeter's coverage areas.
 """
 
+import asyncio
 import logging
+from itertools import islice
 from typing import List, Dict
 from datetime import datetime, timedelta
 
+from aiolimiter import AsyncLimiter
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of queries per scan (DuckDuckGo rate limits)
+MAX_QUERIES = 5
+
+# Maximum number of DuckDuckGo queries in flight at once
+MAX_CONCURRENT_QUERIES = 3
+
+# Token-bucket rate limit for DuckDuckGo: QUERY_RATE_LIMIT queries per QUERY_RATE_PERIOD seconds
+QUERY_RATE_LIMIT = 5
+QUERY_RATE_PERIOD = 10
+
 
 def scan_news(config: Dict, coverage_manifest: Dict) -> List[Dict]:
     """
@@ -29,57 +43,13 @@ def scan_news(config: Dict, coverage_manifest: Dict) -> List[Dict]:
     """
     logger.info("Phase 1 (SCAN): Searching for agricultural news...")
 
-    results = []
-
     try:
         from duckduckgo_search import DDGS
 
-        # Build search queries based on coverage areas
-        queries = _build_search_queries(coverage_manifest)
-
-        # Search for each query with delay to avoid rate limiting
-        import time
-        with DDGS() as ddgs:
-            for i, query in enumerate(queries[:5]):  # Limit to 5 queries to avoid rate limits
-                logger.info(f"Searching: {query}")
-                try:
-                    # Try news search first (more targeted)
-                    try:
-                        search_results = list(ddgs.news(
-                            query,
-                            region='wt-wt',
-                            safesearch='moderate',
-                            max_results=3
-                        ))
-                        logger.info(f"News search returned {len(search_results)} results")
-                    except Exception as e:
-                        logger.info(f"News search failed ({e}), trying text search")
-                        # Fallback to text search if news search fails
-                        search_results = list(ddgs.text(
-                            query,
-                            region='wt-wt',
-                            safesearch='moderate',
-                            max_results=3
-                        ))
-                        logger.info(f"Text search returned {len(search_results)} results")
-
-                    for result in search_results:
-                        results.append({
-                            "source": result.get('source', 'Unknown'),
-                            "headline": result.get('title', 'No title'),
-                            "summary": result.get('body', ''),
-                            "url": result.get('url') or result.get('href', ''),
-                            "date": result.get('date', datetime.now().isoformat()),
-                            "query": query
-                        })
-
-                    # Add delay between queries to avoid rate limiting
-                    if i < len(queries[:5]) - 1:  # Don't delay after last query
-                        time.sleep(2)
-
-                except Exception as e:
-                    logger.warning(f"Failed to search for '{query}': {e}")
-                    continue
+        # Build search queries based on coverage areas (capped to avoid rate limits)
+        queries = _build_search_queries(coverage_manifest, max_queries=MAX_QUERIES)
+
+        results = asyncio.run(_scan_async(DDGS, queries))
 
         logger.info(f"Scan complete: {len(results)} news items found")
         return results
@@ -92,12 +62,97 @@ def scan_news(config: Dict, coverage_manifest: Dict) -> List[Dict]:
         return []
 
 
-def _build_search_queries(coverage_manifest: Dict) -> List[str]:
+async def _scan_async(ddgs_class, queries: List[str]) -> List[Dict]:
+    """
+    Run all search queries concurrently, bounded by a semaphore and a rate limiter.
+
+    The token-bucket limiter replaces the old fixed sleep between queries, so
+    rate-limit budget is only spent when needed and total scan time is roughly
+    the slowest query rather than the sum of all.
+
+    Returns:
+        Flattened list of news items across all queries
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    limiter = AsyncLimiter(QUERY_RATE_LIMIT, QUERY_RATE_PERIOD)
+
+    tasks = [_bounded_search(sem, limiter, ddgs_class, query) for query in queries]
+    query_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = []
+    for query, query_result in zip(queries, query_results):
+        if isinstance(query_result, Exception):
+            logger.warning(f"Failed to search for '{query}': {query_result}")
+            continue
+        results.extend(query_result)
+
+    return results
+
+
+async def _bounded_search(sem: asyncio.Semaphore, limiter: AsyncLimiter, ddgs_class, query: str) -> List[Dict]:
+    """Run a single query in a worker thread once a semaphore slot and rate-limit token are free."""
+    async with sem, limiter:
+        return await asyncio.to_thread(_search_with_new_client, ddgs_class, query)
+
+
+def _search_with_new_client(ddgs_class, query: str) -> List[Dict]:
+    """Run _search with its own DDGS client, since one isn't safe to share between threads."""
+    with ddgs_class() as ddgs:
+        return _search(ddgs, query)
+
+
+def _search(ddgs, query: str) -> List[Dict]:
+    """
+    Search DuckDuckGo for a single query (blocking).
+
+    Returns:
+        List of news items for the query
+    """
+    logger.info(f"Searching: {query}")
+
+    # Try news search first (more targeted)
+    try:
+        search_results = list(ddgs.news(
+            query,
+            region='wt-wt',
+            safesearch='moderate',
+            max_results=3
+        ))
+        logger.info(f"News search returned {len(search_results)} results")
+    except Exception as e:
+        logger.info(f"News search failed ({e}), trying text search")
+        # Fallback to text search if news search fails
+        search_results = list(ddgs.text(
+            query,
+            region='wt-wt',
+            safesearch='moderate',
+            max_results=3
+        ))
+        logger.info(f"Text search returned {len(search_results)} results")
+
+    return [
+        {
+            "source": result.get('source', 'Unknown'),
+            "headline": result.get('title', 'No title'),
+            "summary": result.get('body', ''),
+            "url": result.get('url') or result.get('href', ''),
+            "date": result.get('date', datetime.now().isoformat()),
+            "query": query
+        }
+        for result in search_results
+    ]
+
+
+def _build_search_queries(coverage_manifest: Dict, max_queries: int = MAX_QUERIES) -> List[str]:
     """
     Build search queries based on coverage manifest.
 
+    Args:
+        coverage_manifest: Coverage manifest dict
+        max_queries: Maximum number of queries to return
+
     Returns:
-        List of search query strings
+        List of at most max_queries unique search query strings
     """
     # Use simple, reliable queries that are guaranteed to return results
     # These are well-known organizations and common agricultural terms
@@ -114,4 +169,5 @@ def _build_search_queries(coverage_manifest: Dict) -> List[str]:
         "sustainable farming"
     ]
 
-    return queries
+    # Deduplicate while preserving order - each duplicate is a wasted network call
+    return list(islice(dict.fromkeys(queries), max_queries))
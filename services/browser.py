@@ -3,51 +3,209 @@ Browser automation service for interacting with Demeter AI assistant.
 Uses Playwright to drive conversations at assistant.demeterdata.ag
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
+import re
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from itertools import chain, groupby
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Browser, BrowserContext, ElementHandle
 
 logger = logging.getLogger(__name__)
 
+# Set by _ensure_playwright on first use, so importing this module doesn't load Playwright
+async_playwright = None
+PlaywrightTimeout = None
+
 # DOM selectors for Demeter AI assistant
 # Updated 2026-01-31 based on actual UI inspection
 SELECTORS = {
     "chat_input": "textarea[placeholder='Reply...']",
     "send_button": "button[type='submit']",
-    "loading_spinner": "svg",  # Spinner appears while loading
-    "main_content": "main"  # Main content area contains messages
+    # Only present while a response is in flight (a bare "svg" also matches the page's static icons)
+    "loading_spinner": "svg.animate-spin, [role='progressbar'], [aria-busy='true']",
+    "main_content": "main",  # Main content area contains messages
+    "response_last": "[data-role='assistant'], [class*='assistant']"  # Assistant message bubbles; the last is the newest
+}
+
+# Marks the start of each answer in a batched response, e.g. "[Q2]: ..."
+_BATCH_MARKER_RE = re.compile(r"\[Q(\d+)\]:\s*")
+
+# Upper bound on waiting for the page to go network-idle after navigation
+PAGE_READY_TIMEOUT_MS = 10000
+
+# How long to wait for the response to start (spinner or new message) after sending
+SPINNER_APPEAR_TIMEOUT_MS = 10000
+
+# How long the response area must go without DOM mutations to count as complete
+RESPONSE_IDLE_MS = 4000
+
+# Share of the response timeout spent waiting for the spinner to detach; the
+# rest is left for the idle check if the spinner outlasts it
+SPINNER_DETACH_SHARE = 0.5
+
+# Resolves true once the element's subtree has had no mutations for idleMs,
+# or false if it is still changing after maxMs
+_WAIT_FOR_IDLE_JS = """
+([selector, idleMs, maxMs]) => new Promise((resolve, reject) => {
+    const target = document.querySelector(selector);
+    if (!target) {
+        reject(new Error(`No element matches ${selector}`));
+        return;
+    }
+    let idleTimer = null;
+    let maxTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(idleTimer);
+        idleTimer = setTimeout(() => finish(true), idleMs);
+    });
+    const finish = (idle) => {
+        observer.disconnect();
+        clearTimeout(idleTimer);
+        clearTimeout(maxTimer);
+        resolve(idle);
+    };
+    observer.observe(target, {subtree: true, childList: true, characterData: true});
+    idleTimer = setTimeout(() => finish(true), idleMs);
+    maxTimer = setTimeout(() => finish(false), maxMs);
+})
+"""
+
+# Returns [length, FNV-1a hash] of the element's text - a cheap fingerprint
+# that catches same-length edits without transferring the text itself
+_TEXT_FINGERPRINT_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    const text = el ? el.innerText : "";
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return [text.length, hash >>> 0];
 }
+"""
+
+# innerText of the last element matching selector (document order), or null.
+# One round trip instead of a count() followed by inner_text().
+_LAST_MATCH_TEXT_JS = """
+(selector) => {
+    const matches = document.querySelectorAll(selector);
+    return matches.length ? matches[matches.length - 1].innerText : null;
+}
+"""
+
+# Number of elements matching selector
+_COUNT_MATCHES_JS = "(selector) => document.querySelectorAll(selector).length"
+
+# True once a sent message is being answered: the loading spinner is showing,
+# or a new assistant message has appeared since `before` were counted
+_RESPONSE_STARTED_JS = """
+([spinnerSelector, responseSelector, before]) =>
+    document.querySelector(spinnerSelector) !== null
+    || document.querySelectorAll(responseSelector).length > before
+"""
+
+# Resolves with the first element matching selector once it exists and is not
+# disabled, re-checking on every DOM mutation; resolves null after timeoutMs
+_WAIT_ENABLED_JS = """
+([selector, timeoutMs]) => new Promise((resolve) => {
+    const ready = () => {
+        const el = document.querySelector(selector);
+        return el && !el.disabled ? el : null;
+    };
+    const found = ready();
+    if (found) {
+        resolve(found);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        const el = ready();
+        if (el) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(el);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(null);
+    }, timeoutMs);
+    observer.observe(document.body, {subtree: true, childList: true, attributes: true, attributeFilter: ["disabled"]});
+})
+"""
+
+
+def _ensure_playwright() -> None:
+    """Import Playwright on first use."""
+    global async_playwright, PlaywrightTimeout
+    if async_playwright is None:
+        from playwright.async_api import async_playwright as _async_playwright, TimeoutError as _PlaywrightTimeout
+        async_playwright, PlaywrightTimeout = _async_playwright, _PlaywrightTimeout
 
 
 class DemeterAIBrowser:
     """Manages Playwright browser sessions with Demeter AI assistant."""
 
-    def __init__(self, url: str, timeout_seconds: int = 120):
+    def __init__(self, url: str, timeout_seconds: int = 120, browser: Optional[Browser] = None):
+        """
+        Args:
+            url: URL of the Demeter AI assistant
+            timeout_seconds: Timeout for each response
+            browser: Optional shared browser (from launch_browser()) to open this
+                session's context in. If None, the session launches its own
+                browser and closes it on exit.
+        """
         self.url = url
         self.timeout = timeout_seconds * 1000  # Convert to milliseconds
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        # Owns the browser launched when none was passed in
+        self._own_browser: Optional[AsyncExitStack] = None
+        # Cached input handle, reused across exchanges until the page reloads
+        self._input_handle: Optional[ElementHandle] = None
 
     async def __aenter__(self):
-        """Context manager entry - launch browser."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.page = await self.browser.new_page()
-        await self.page.goto(self.url)
-        logger.info(f"Browser launched and navigated to {self.url}")
-
-        # Wait for page to be ready
-        await asyncio.sleep(3)
+        """Context manager entry - open a fresh context (and page) in the browser."""
+        _ensure_playwright()
+        if self.browser is None:
+            self._own_browser = AsyncExitStack()
+            self.browser = await self._own_browser.enter_async_context(launch_browser())
+        try:
+            self.context = await self.browser.new_context()
+            self.page = await self.context.new_page()
+            await self.page.goto(self.url)
+            logger.info(f"Browser session opened and navigated to {self.url}")
+
+            await self._wait_until_ready()
+        except BaseException:
+            # __aexit__ won't run if entry fails, so release the context and any own browser here
+            await self.__aexit__(None, None, None)
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close browser."""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
-        logger.info("Browser closed")
+        """Context manager exit - close the session's context, and its browser if it launched one."""
+        if self.context:
+            await self.context.close()
+        if self._own_browser is not None:
+            await self._own_browser.aclose()
+            self._own_browser = None
+            self.browser = None
+        logger.info("Browser session closed")
+
+    async def _wait_until_ready(self):
+        """Wait for the page to settle after navigation instead of sleeping a fixed time."""
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=PAGE_READY_TIMEOUT_MS)
+        except PlaywrightTimeout:
+            logger.warning("Page never went network-idle, continuing anyway")
 
     async def send_message(self, message: str) -> str:
         """
@@ -71,17 +229,27 @@ class DemeterAIBrowser:
             logger.info(f"Sending message: {message[:100]}...")
 
             # Wait for and fill the input field
-            input_field = await self.page.wait_for_selector(SELECTORS["chat_input"], timeout=10000)
-            await input_field.fill(message)
-            await asyncio.sleep(0.5)
+            if self._input_handle is None or not await self._input_handle.is_visible():
+                self._input_handle = await self.page.wait_for_selector(SELECTORS["chat_input"], timeout=10000)
+            await self._input_handle.fill(message)
 
             # Wait for the send button to be enabled (not disabled)
-            send_button = await self.page.wait_for_selector(
-                f"{SELECTORS['send_button']}:not([disabled])",
-                timeout=10000,
-                state="attached"
-            )
-            await send_button.click()
+            send_button = await self._wait_enabled(SELECTORS["send_button"])
+            responses_before = await self.page.evaluate(_COUNT_MATCHES_JS, SELECTORS["response_last"])
+            try:
+                await send_button.click()
+            finally:
+                await send_button.dispose()
+
+            # Confirm the request fired: the spinner shows or a new assistant message appears
+            try:
+                await self.page.wait_for_function(
+                    _RESPONSE_STARTED_JS,
+                    arg=[SELECTORS["loading_spinner"], SELECTORS["response_last"], responses_before],
+                    timeout=SPINNER_APPEAR_TIMEOUT_MS
+                )
+            except PlaywrightTimeout:
+                logger.debug("No spinner or new message seen after sending, response may already be complete")
 
             logger.info("Message sent, waiting for response...")
 
@@ -98,6 +266,31 @@ class DemeterAIBrowser:
             logger.error(f"Error sending message: {e}")
             raise
 
+    async def _wait_enabled(self, selector: str, timeout_ms: int = 10000) -> ElementHandle:
+        """
+        Wait for an element to exist and be enabled, driven by DOM mutations.
+
+        Resolves on the browser tick the element becomes ready rather than on
+        Playwright's retry interval, and returns the element so it doesn't
+        need to be queried again.
+
+        Args:
+            selector: CSS selector of the element
+            timeout_ms: How long to wait before failing
+
+        Returns:
+            Handle to the enabled element; the caller should dispose it when done
+
+        Raises:
+            PlaywrightTimeout: If the element isn't enabled within timeout_ms
+        """
+        handle = await self.page.evaluate_handle(_WAIT_ENABLED_JS, [selector, timeout_ms])
+        element = handle.as_element()
+        if element is None:
+            await handle.dispose()
+            raise PlaywrightTimeout(f"Timeout {timeout_ms}ms exceeded waiting for {selector} to be enabled")
+        return element
+
     async def _wait_for_response(self) -> str:
         """
         Wait for the assistant's response to complete.
@@ -105,33 +298,35 @@ class DemeterAIBrowser:
         Returns:
             The complete response text
         """
-        # Wait for the response to start appearing
-        await asyncio.sleep(5)
-
         # Get the main content area
         main_element = await self.page.query_selector(SELECTORS["main_content"])
         if not main_element:
             raise RuntimeError("Could not find main content area")
 
-        # Monitor the text content until it stops changing (response complete)
-        previous_text = ""
-        stable_count = 0
-        max_wait_iterations = 30  # 30 * 2 seconds = 60 seconds max
-
-        for i in range(max_wait_iterations):
-            current_text = await main_element.inner_text()
-
-            if current_text == previous_text:
-                stable_count += 1
-                if stable_count >= 3:  # Text hasn't changed for 6 seconds
-                    break
-            else:
-                stable_count = 0
-                previous_text = current_text
+        # The loading spinner going away is the direct completion signal.
+        # Both waits share one response timeout, so a message never waits longer than that.
+        started = time.monotonic()
+        if not await self._wait_for_spinner_detached(int(self.timeout * SPINNER_DETACH_SHARE)):
+            # No spinner to watch: wait until the main content stops changing.
+            # A MutationObserver in the page signals idleness, so we don't poll.
+            remaining_ms = max(self.timeout - int((time.monotonic() - started) * 1000), RESPONSE_IDLE_MS)
+            try:
+                idle = await self.page.evaluate(
+                    _WAIT_FOR_IDLE_JS,
+                    [SELECTORS["main_content"], RESPONSE_IDLE_MS, remaining_ms]
+                )
+                if not idle:
+                    logger.warning(f"Response still changing after {self.timeout/1000}s, reading it anyway")
+            except Exception as e:
+                logger.warning(f"Mutation observer unavailable ({e}), polling for stable text")
+                await self._poll_until_stable()
 
-            await asyncio.sleep(2)
+        # Read just the newest assistant message
+        response_text = await self._read_last_response()
+        if response_text:
+            return response_text
 
-        # Extract just the assistant's response (everything after the question)
+        # Fallback: extract the response from the whole main area (everything after the question)
         full_text = await main_element.inner_text()
 
         # The response is everything after the first occurrence of the question
@@ -156,50 +351,273 @@ class DemeterAIBrowser:
         logger.warning("Could not parse response cleanly, returning full text")
         return full_text.strip()
 
+    async def _read_last_response(self) -> Optional[str]:
+        """
+        Read the text of the last assistant message bubble.
+
+        Returns:
+            The message text, or None if no assistant bubble can be found
+        """
+        text = await self.page.evaluate(_LAST_MATCH_TEXT_JS, SELECTORS["response_last"])
+        return text.strip() if text is not None else None
+
+    async def _wait_for_spinner_detached(self, timeout_ms: int) -> bool:
+        """
+        Wait for the loading spinner to leave the DOM.
+
+        Args:
+            timeout_ms: How long to wait for the spinner before giving up
+
+        Returns:
+            True once the spinner has gone, False if there was no spinner to
+            wait on or it outlasted the timeout
+        """
+        if not await self.page.query_selector(SELECTORS["loading_spinner"]):
+            return False
+
+        started = time.monotonic()
+        try:
+            await self.page.wait_for_selector(SELECTORS["loading_spinner"], state="detached", timeout=timeout_ms)
+        except PlaywrightTimeout:
+            logger.warning(f"Loading spinner still present after {timeout_ms/1000}s, falling back to idle check")
+            return False
+
+        logger.debug(f"Loading spinner detached after {time.monotonic() - started:.1f}s")
+        return True
+
+    async def _poll_until_stable(self):
+        """
+        Fallback stability check: poll a fingerprint of the text until it stops changing.
+
+        Each poll returns only the text length and hash rather than the full
+        text, so long responses aren't serialized across the wire every time.
+        """
+        previous_fingerprint = None
+        stable_count = 0
+        max_wait_iterations = 30  # 30 * 2 seconds = 60 seconds max
+
+        for i in range(max_wait_iterations):
+            current_fingerprint = await self.page.evaluate(_TEXT_FINGERPRINT_JS, SELECTORS["main_content"])
+
+            if current_fingerprint == previous_fingerprint:
+                stable_count += 1
+                if stable_count >= 3:  # Text hasn't changed for 6 seconds
+                    break
+            else:
+                stable_count = 0
+                previous_fingerprint = current_fingerprint
+
+            await asyncio.sleep(2)
+
     async def start_new_conversation(self):
         """Start a new conversation (refresh page or click new chat button)."""
         logger.info("Starting new conversation")
         # Simple approach: reload the page
         await self.page.reload()
-        await asyncio.sleep(3)
+        self._input_handle = None
+        await self._wait_until_ready()
+
 
+@asynccontextmanager
+async def launch_browser() -> AsyncIterator[Browser]:
+    """
+    Launch one headless Chromium to be shared across conversations.
 
-async def run_conversation(url: str, exchanges: List[Dict[str, str]], timeout: int = 120) -> List[Dict[str, str]]:
+    Each conversation run against it gets its own isolated browser context.
+    """
+    _ensure_playwright()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+async def run_conversation(
+    url: str,
+    exchanges: List[Dict[str, str]],
+    timeout: int = 120,
+    browser: Optional[Browser] = None,
+    max_parallel_pages: int = 4,
+    batch_size: int = 1
+) -> List[Dict[str, str]]:
     """
     Run a complete conversation with the Demeter AI assistant.
 
+    Exchanges run in order in a single chat. Consecutive exchanges marked
+    'independent' (they don't build on earlier answers) are instead spread
+    across a pool of fresh chat sessions and answered concurrently, and
+    can be asked batch_size at a time in a single numbered message.
+
     Args:
         url: URL of the Demeter AI assistant
         exchanges: List of exchanges, each with 'question' key (response will be added)
+            and optional 'independent' flag (default False)
         timeout: Timeout in seconds for each response
+        browser: Optional shared browser from launch_browser()
+        max_parallel_pages: Maximum chat sessions used for a run of independent exchanges
+        batch_size: Independent questions combined into one message (1 disables batching)
 
     Returns:
         List of exchanges with both 'question' and 'response' keys
     """
     results = []
+    batch_size = max(batch_size, 1)
+
+    async with DemeterAIBrowser(url, timeout, browser=browser) as session:
+        for independent, run in groupby(enumerate(exchanges), key=lambda e: bool(e[1].get("independent"))):
+            run = list(run)
+            if independent and len(run) > 1:
+                batches = [run[k:k + batch_size] for k in range(0, len(run), batch_size)]
+                if len(batches) > 1:
+                    run_results = await _ask_in_parallel(session, url, timeout, batches, max_parallel_pages)
+                else:
+                    run_results = await _ask_batch(session, batches[0])
+            else:
+                run_results = [await _ask(session, i, exchange) for i, exchange in run]
+            results.extend(r for r in run_results if r is not None)
 
-    async with DemeterAIBrowser(url, timeout) as browser:
-        for i, exchange in enumerate(exchanges):
-            question = exchange.get("question", "")
-            if not question:
-                logger.warning(f"Exchange {i} has no question, skipping")
-                continue
+    return results
 
-            try:
-                response = await browser.send_message(question)
-                results.append({
-                    "question": question,
-                    "response": response
-                })
 
-                # Small delay between exchanges
-                await asyncio.sleep(2)
+async def _ask(session: DemeterAIBrowser, i: int, exchange: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """
+    Ask a single exchange's question in a session.
 
-            except Exception as e:
-                logger.error(f"Failed to get response for exchange {i}: {e}")
-                results.append({
-                    "question": question,
-                    "response": f"[ERROR: {str(e)}]"
-                })
+    Returns:
+        Exchange with 'question' and 'response' (an [ERROR: ...] marker on failure),
+        or None if the exchange has no question
+    """
+    question = exchange.get("question", "")
+    if not question:
+        logger.warning(f"Exchange {i} has no question, skipping")
+        return None
+
+    try:
+        response = await session.send_message(question)
+        return {
+            "question": question,
+            "response": response
+        }
+    except Exception as e:
+        logger.error(f"Failed to get response for exchange {i}: {e}")
+        return {
+            "question": question,
+            "response": f"[ERROR: {str(e)}]"
+        }
+
+
+async def _ask_batch(
+    session: DemeterAIBrowser,
+    batch: List[Tuple[int, Dict[str, str]]]
+) -> List[Optional[Dict[str, str]]]:
+    """
+    Ask several independent questions in one message and split the answer.
 
-    return results
+    Falls back to asking them one at a time if the response can't be split
+    into one answer per question.
+
+    Returns:
+        Results in the same order as batch (None for exchanges with no question)
+    """
+    asked = [(i, exchange) for i, exchange in batch if exchange.get("question")]
+    if len(asked) < 2:
+        return [await _ask(session, i, exchange) for i, exchange in batch]
+
+    for i, exchange in batch:
+        if not exchange.get("question"):
+            logger.warning(f"Exchange {i} has no question, skipping")
+
+    questions = [exchange["question"] for _, exchange in asked]
+    message = (
+        "Please answer the following questions in order, starting each answer "
+        "with its marker ([Q1]:, [Q2]: ...).\n\n"
+        + "\n".join(f"{n}. {question}" for n, question in enumerate(questions, 1))
+    )
+
+    try:
+        response = await session.send_message(message)
+    except Exception as e:
+        logger.error(f"Failed to get response for batched exchanges {[i for i, _ in asked]}: {e}")
+        answers = [f"[ERROR: {str(e)}]"] * len(asked)
+    else:
+        answers = _split_batch_response(response, len(asked))
+        if answers is None:
+            logger.warning(f"Could not split batched response into {len(asked)} answers, asking individually")
+            return [await _ask(session, i, exchange) for i, exchange in batch]
+
+    answer_iter = iter(answers)
+    return [
+        {"question": exchange["question"], "response": next(answer_iter)} if exchange.get("question") else None
+        for _, exchange in batch
+    ]
+
+
+def _split_batch_response(response: str, count: int) -> Optional[List[str]]:
+    """
+    Split a batched response on its [Qn]: markers.
+
+    Returns:
+        One answer per question in order, or None if any marker is missing
+    """
+    parts = _BATCH_MARKER_RE.split(response)
+    answers: Dict[int, str] = {}
+    # parts alternates [preamble, number, answer, number, answer, ...]
+    for number, answer in zip(parts[1::2], parts[2::2]):
+        answers.setdefault(int(number), answer.strip())
+
+    if not all(n in answers for n in range(1, count + 1)):
+        return None
+    return [answers[n] for n in range(1, count + 1)]
+
+
+async def _ask_in_parallel(
+    session: DemeterAIBrowser,
+    url: str,
+    timeout: int,
+    batches: List[List[Tuple[int, Dict[str, str]]]],
+    max_parallel_pages: int
+) -> List[Optional[Dict[str, str]]]:
+    """
+    Answer a run of independent exchanges concurrently.
+
+    Opens a pool of fresh chat sessions in the same browser; each session
+    works through a shared queue one batch of questions at a time. Sessions
+    that fail to open are skipped, and if none open the main session works
+    through the queue alone.
+
+    Returns:
+        Results in the same order as the exchanges in batches
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for slot, batch in enumerate(batches):
+        queue.put_nowait((slot, batch))
+    batch_results: List[List[Optional[Dict[str, str]]]] = [[] for _ in batches]
+
+    async def worker(pool_session: DemeterAIBrowser):
+        while not queue.empty():
+            slot, batch = queue.get_nowait()
+            batch_results[slot] = await _ask_batch(pool_session, batch)
+
+    num_questions = sum(len(batch) for batch in batches)
+    num_pages = min(max_parallel_pages, len(batches))
+    logger.info(f"Answering {num_questions} independent questions across {num_pages} sessions")
+
+    async with AsyncExitStack() as stack:
+        # Open the pool sessions concurrently; one that fails to open just shrinks the pool
+        opened = await asyncio.gather(
+            *[stack.enter_async_context(DemeterAIBrowser(url, timeout, browser=session.browser))
+              for _ in range(num_pages)],
+            return_exceptions=True,
+        )
+        pool = [pool_session for pool_session in opened if not isinstance(pool_session, BaseException)]
+        for error in opened:
+            if isinstance(error, BaseException):
+                logger.warning(f"Could not open a pool session ({error}), continuing with {len(pool)}")
+        if not pool:
+            logger.warning("No pool sessions opened, answering the independent questions in the main session")
+            pool = [session]
+        await asyncio.gather(*[worker(pool_session) for pool_session in pool])
+
+    return list(chain.from_iterable(batch_results))
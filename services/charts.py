@@ -1,20 +1,147 @@
 """
-Chart generation service using matplotlib.
+Chart generation service using matplotlib (and Pillow for tables).
 
 Renders branded charts based on structured specifications from Claude API.
 Supports: horizontal_bar, vertical_bar, line, table.
 """
 
+from __future__ import annotations
+
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+import msgspec
+from PIL import Image, ImageDraw, ImageFont
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 logger = logging.getLogger(__name__)
 
+# matplotlib.pyplot, imported on first use by _ensure_mpl (importing it is slow)
+plt = None
+
+# Figures reused across renders, keyed by figsize (inches). Building a fresh
+# figure per chart is a large share of render time in batches. Sizes come from
+# the model's chart specs, so the cache is a small LRU rather than unbounded.
+FIG_CACHE_SIZE = 4
+_FIG_CACHE: OrderedDict[Tuple[float, float], plt.Figure] = OrderedDict()
+
+# Matplotlib's pyplot state and the cached figures aren't safe to share between threads
+_RENDER_LOCK = threading.Lock()
+
+DEFAULT_FONT = "Roboto"
+
+# Font files shipped with the service (e.g. Roboto-Regular.ttf, Roboto-Bold.ttf),
+# registered with matplotlib and used by Pillow so rendering doesn't depend on system fonts
+_FONT_DIR = Path(__file__).parent / "fonts"
+
+
+class ChartData(msgspec.Struct):
+    """Data section of a chart spec. Which fields are used depends on the chart type."""
+    labels: List[Any] = []
+    values: List[float] = []
+    comparison_values: Optional[List[float]] = None
+    # The prompt schema lets the model send null for these; defaults are applied where they're used
+    series_name: Optional[str] = None
+    comparison_series_name: Optional[str] = None
+    columns: List[Any] = []
+    rows: List[List[Any]] = []
+
+
+class ChartSpec(msgspec.Struct):
+    """Chart specification as produced by the content writer prompt."""
+    type: str = "horizontal_bar"
+    title: Optional[str] = None
+    source: Optional[str] = None
+    data: ChartData = msgspec.field(default_factory=ChartData)
+    highlight_index: Optional[int] = None
+    size: Optional[Tuple[int, int]] = None  # Pixels; defaults depend on chart type
+
+
+class _Palette(NamedTuple):
+    """Brand colours resolved once per chart."""
+    gold: str
+    dark: str
+    light_blue: str
+    white: str
+    linen: str
+
+    @classmethod
+    def from_colours(cls, colours: Dict) -> "_Palette":
+        return cls(
+            gold=colours.get("primary_gold", "#E8C07D"),
+            dark=colours.get("primary_dark_brown", "#47403F"),
+            light_blue=colours.get("secondary_light_blue", "#CADAE8"),
+            white=colours.get("white", "#FFFFFF"),
+            linen=colours.get("secondary_linen", "#F7EFE4"),
+        )
+
+
+# Fraction of the figure height kept clear at the bottom for the source line
+SOURCE_STRIP = 0.05
+
+# Table layout (pixels). Tables are drawn with Pillow rather than matplotlib.
+TABLE_FONT_SIZE = 20
+TABLE_TITLE_SIZE = 28
+TABLE_SOURCE_SIZE = 16
+TABLE_CELL_PAD = 12
+TABLE_MARGIN = 40
+
+# Pillow fonts keyed by (size, bold)
+_PIL_FONTS: Dict[Tuple[int, bool], ImageFont.ImageFont] = {}
+
+
+def _ensure_mpl() -> None:
+    """Import matplotlib and apply the brand styling, once per process."""
+    global plt
+    if plt is not None:
+        return
+
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as pyplot
+    from matplotlib import font_manager
+
+    for font_path in sorted(_FONT_DIR.glob("*.ttf")):
+        font_manager.fontManager.addfont(str(font_path))
+
+    # Brand styling, applied once rather than on every chart
+    pyplot.rcdefaults()
+    pyplot.rcParams.update({
+        'font.family': _resolve_font(DEFAULT_FONT),
+        'axes.spines.top': False,
+        'axes.spines.right': False,
+        'axes.edgecolor': '#CCCCCC',
+        'axes.axisbelow': True,
+        'grid.alpha': 0.3,
+        'grid.linestyle': '-',
+        'grid.linewidth': 0.5,
+    })
+    plt = pyplot
+
+
+@lru_cache(maxsize=None)
+def _resolve_font(family: str) -> str:
+    """
+    Check once whether matplotlib can find a font family.
+
+    Returns:
+        family if it's available, else the generic "sans-serif" (after one
+        warning), so missing fonts aren't looked up and warned about per chart
+    """
+    from matplotlib import font_manager
+
+    try:
+        font_manager.findfont(font_manager.FontProperties(family=family), fallback_to_default=False)
+        return family
+    except ValueError:
+        logger.warning(f"Font '{family}' not found; add its TTF files to {_FONT_DIR}. Using default sans-serif")
+        return "sans-serif"
+
 
 def generate_chart(chart_spec: Dict, config: Dict, output_name: str) -> str:
     """
@@ -28,68 +155,109 @@ def generate_chart(chart_spec: Dict, config: Dict, output_name: str) -> str:
     Returns:
         Path to generated chart image file
     """
-    logger.info(f"Generating {chart_spec['type']} chart: {chart_spec.get('title', 'Untitled')}")
+    # Validate and convert the whole spec in one pass
+    try:
+        spec = msgspec.convert(chart_spec, ChartSpec, strict=False)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Invalid chart spec: {e}") from e
+
+    logger.info(f"Generating {spec.type} chart: {spec.title or 'Untitled'}")
 
     # Extract brand settings
     brand = config.get("brand", {})
-    colours = brand.get("colours", {})
-
-    # Set up matplotlib with brand settings
-    plt.style.use('default')
-
-    # Try to set Roboto font, fall back to system default if not available
-    try:
-        plt.rcParams['font.family'] = brand.get('font', 'Roboto')
-    except:
-        logger.warning("Roboto font not available, using default")
-
-    # Create chart based on type
-    chart_type = chart_spec.get("type", "horizontal_bar")
-
-    if chart_type == "horizontal_bar":
-        fig = _create_horizontal_bar(chart_spec, colours)
-    elif chart_type == "vertical_bar":
-        fig = _create_vertical_bar(chart_spec, colours)
-    elif chart_type == "line":
-        fig = _create_line_chart(chart_spec, colours)
-    elif chart_type == "table":
-        fig = _create_table(chart_spec, colours)
-    else:
-        logger.warning(f"Unknown chart type '{chart_type}', defaulting to horizontal_bar")
-        fig = _create_horizontal_bar(chart_spec, colours)
+    palette = _Palette.from_colours(brand.get("colours", {}))
 
-    # Save the chart
+    # Save location
     output_dir = Path("output/charts")
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"{output_name}.png"
 
-    fig.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
+    chart_type = spec.type
+
+    # Tables bypass matplotlib entirely
+    if chart_type == "table":
+        _create_table(spec, palette).save(output_path, "PNG")
+        return str(output_path)
+
+    with _RENDER_LOCK:
+        _ensure_mpl()
+
+        # Only touch rcParams if the configured font differs from the current one
+        font = _resolve_font(brand.get('font', DEFAULT_FONT))
+        if plt.rcParams['font.family'] != [font]:
+            plt.rcParams['font.family'] = font
+
+        # Create chart based on type
+        if chart_type == "horizontal_bar":
+            fig = _create_horizontal_bar(spec, palette)
+        elif chart_type == "vertical_bar":
+            fig = _create_vertical_bar(spec, palette)
+        elif chart_type == "line":
+            fig = _create_line_chart(spec, palette)
+        else:
+            logger.warning(f"Unknown chart type '{chart_type}', defaulting to horizontal_bar")
+            fig = _create_horizontal_bar(spec, palette)
+
+        # Save the chart (the figure stays cached for the next render)
+        fig.savefig(output_path, dpi=150, facecolor='white')
+        fig.clear()
 
-    logger.info(f"Chart saved to {output_path}")
+    # The caller logs where the chart was saved (the generate phase renders in worker processes)
     return str(output_path)
 
 
-def _create_horizontal_bar(spec: Dict, colours: Dict) -> plt.Figure:
+def _get_figure(figsize: Tuple[float, float]) -> Tuple[plt.Figure, plt.Axes]:
+    """
+    Get a blank figure of the given size with a single Axes.
+
+    Figures are cached per size (least recently used evicted past
+    FIG_CACHE_SIZE) and cleared between renders rather than reallocated.
+    Call with _RENDER_LOCK held.
+    """
+    figsize = tuple(figsize)
+    fig = _FIG_CACHE.get(figsize)
+    if fig is None:
+        if len(_FIG_CACHE) >= FIG_CACHE_SIZE:
+            _, stale = _FIG_CACHE.popitem(last=False)
+            plt.close(stale)
+        # Constrained layout fits the axes at draw time, so savefig doesn't need a
+        # second bbox_inches='tight' pass. The bottom strip is kept for the source line.
+        fig = plt.figure(figsize=figsize, layout='constrained')
+        fig.get_layout_engine().set(rect=(0, SOURCE_STRIP, 1, 1 - SOURCE_STRIP))
+        _FIG_CACHE[figsize] = fig
+    else:
+        _FIG_CACHE.move_to_end(figsize)
+        fig.clear()
+    return fig, fig.add_subplot()
+
+
+def _add_source(fig: plt.Figure, source: str) -> None:
+    """Add the source caption to the bottom-right corner of a figure."""
+    fig.text(0.95, 0.02, f"Source: {source}", ha='right', va='bottom',
+             fontsize=8, color='#666666')
+
+
+def _bar_colours(count: int, highlight_index: Optional[int], palette: _Palette) -> List[str]:
+    """Dark bars with the highlighted one (if any) in gold."""
+    bar_colours = [palette.dark] * count
+    if highlight_index is not None and 0 <= highlight_index < count:
+        bar_colours[highlight_index] = palette.gold
+    return bar_colours
+
+
+def _create_horizontal_bar(spec: ChartSpec, palette: _Palette) -> plt.Figure:
     """Create a horizontal bar chart."""
-    data = spec.get("data", {})
-    labels = data.get("labels", [])
-    values = data.get("values", [])
-    highlight_index = spec.get("highlight_index")
+    labels = spec.data.labels
+    values = spec.data.values
+    highlight_index = spec.highlight_index
 
     # Determine figure size
-    size = spec.get("size", [1200, 1200])
+    size = spec.size or (1200, 1200)
     figsize = (size[0] / 150, size[1] / 150)  # Convert pixels to inches at 150 DPI
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _get_figure(figsize)
 
-    # Determine bar colours
-    bar_colours = []
-    for i in range(len(labels)):
-        if highlight_index is not None and i == highlight_index:
-            bar_colours.append(colours.get("primary_gold", "#E8C07D"))
-        else:
-            bar_colours.append(colours.get("primary_dark_brown", "#47403F"))
+    bar_colours = _bar_colours(len(labels), highlight_index, palette)
 
     # Create horizontal bars
     y_pos = range(len(labels))
@@ -101,47 +269,33 @@ def _create_horizontal_bar(spec: Dict, colours: Dict) -> plt.Figure:
     ax.invert_yaxis()  # Highest value at top
 
     # Title
-    title = spec.get("title", "")
+    title = spec.title or ""
     ax.set_title(title, fontsize=14, fontweight='bold',
-                 color=colours.get("primary_dark_brown", "#47403F"),
+                 color=palette.dark,
                  pad=20, loc='left')
 
     # Source
-    source = spec.get("source", "")
-    fig.text(0.95, 0.02, f"Source: {source}", ha='right', va='bottom',
-             fontsize=8, color='#666666')
+    _add_source(fig, spec.source or "")
 
-    # Styling
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color('#CCCCCC')
-    ax.spines['bottom'].set_color('#CCCCCC')
-    ax.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax.set_axisbelow(True)
+    # Styling (spines and grid style come from rcParams)
+    ax.grid(axis='x')
 
     return fig
 
 
-def _create_vertical_bar(spec: Dict, colours: Dict) -> plt.Figure:
+def _create_vertical_bar(spec: ChartSpec, palette: _Palette) -> plt.Figure:
     """Create a vertical bar chart."""
-    data = spec.get("data", {})
-    labels = data.get("labels", [])
-    values = data.get("values", [])
-    highlight_index = spec.get("highlight_index")
+    labels = spec.data.labels
+    values = spec.data.values
+    highlight_index = spec.highlight_index
 
     # Determine figure size
-    size = spec.get("size", [1200, 675])
+    size = spec.size or (1200, 675)
     figsize = (size[0] / 150, size[1] / 150)
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _get_figure(figsize)
 
-    # Determine bar colours
-    bar_colours = []
-    for i in range(len(labels)):
-        if highlight_index is not None and i == highlight_index:
-            bar_colours.append(colours.get("primary_gold", "#E8C07D"))
-        else:
-            bar_colours.append(colours.get("primary_dark_brown", "#47403F"))
+    bar_colours = _bar_colours(len(labels), highlight_index, palette)
 
     # Create vertical bars
     x_pos = range(len(labels))
@@ -152,128 +306,143 @@ def _create_vertical_bar(spec: Dict, colours: Dict) -> plt.Figure:
     ax.set_xticklabels(labels, rotation=45, ha='right')
 
     # Title
-    title = spec.get("title", "")
+    title = spec.title or ""
     ax.set_title(title, fontsize=14, fontweight='bold',
-                 color=colours.get("primary_dark_brown", "#47403F"),
+                 color=palette.dark,
                  pad=20, loc='left')
 
     # Source
-    source = spec.get("source", "")
-    fig.text(0.95, 0.02, f"Source: {source}", ha='right', va='bottom',
-             fontsize=8, color='#666666')
+    _add_source(fig, spec.source or "")
 
-    # Styling
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color('#CCCCCC')
-    ax.spines['bottom'].set_color('#CCCCCC')
-    ax.grid(axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax.set_axisbelow(True)
+    # Styling (spines and grid style come from rcParams)
+    ax.grid(axis='y')
 
     return fig
 
 
-def _create_line_chart(spec: Dict, colours: Dict) -> plt.Figure:
+def _create_line_chart(spec: ChartSpec, palette: _Palette) -> plt.Figure:
     """Create a line chart."""
-    data = spec.get("data", {})
-    labels = data.get("labels", [])
-    values = data.get("values", [])
+    labels = spec.data.labels
+    values = spec.data.values
 
     # Determine figure size
-    size = spec.get("size", [1200, 675])
+    size = spec.size or (1200, 675)
     figsize = (size[0] / 150, size[1] / 150)
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _get_figure(figsize)
 
     # Plot main line
-    ax.plot(labels, values, color=colours.get("primary_gold", "#E8C07D"),
+    ax.plot(labels, values, color=palette.gold,
             linewidth=2.5, marker='o', markersize=6)
 
     # Plot comparison line if present
-    if "comparison_values" in data:
-        comparison = data["comparison_values"]
-        ax.plot(labels, comparison, color=colours.get("secondary_light_blue", "#CADAE8"),
+    if spec.data.comparison_values is not None:
+        comparison = spec.data.comparison_values
+        ax.plot(labels, comparison, color=palette.light_blue,
                 linewidth=2.5, marker='o', markersize=6, linestyle='--')
 
         # Add legend
-        series_name = data.get("series_name", "Series 1")
-        comparison_name = data.get("comparison_series_name", "Series 2")
+        series_name = spec.data.series_name or "Series 1"
+        comparison_name = spec.data.comparison_series_name or "Series 2"
         ax.legend([series_name, comparison_name])
 
     # Title
-    title = spec.get("title", "")
+    title = spec.title or ""
     ax.set_title(title, fontsize=14, fontweight='bold',
-                 color=colours.get("primary_dark_brown", "#47403F"),
+                 color=palette.dark,
                  pad=20, loc='left')
 
     # Source
-    source = spec.get("source", "")
-    fig.text(0.95, 0.02, f"Source: {source}", ha='right', va='bottom',
-             fontsize=8, color='#666666')
+    _add_source(fig, spec.source or "")
 
-    # Styling
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color('#CCCCCC')
-    ax.spines['bottom'].set_color('#CCCCCC')
-    ax.grid(axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax.set_axisbelow(True)
+    # Styling (spines and grid style come from rcParams)
+    ax.grid(axis='y')
 
     return fig
 
 
-def _create_table(spec: Dict, colours: Dict) -> plt.Figure:
-    """Create a table image."""
-    data = spec.get("data", {})
-    columns = data.get("columns", [])
-    rows = data.get("rows", [])
-    highlight_index = spec.get("highlight_index")
+def _load_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """Load (and cache) the brand font for Pillow, falling back to the bundled default."""
+    key = (size, bold)
+    if key not in _PIL_FONTS:
+        name = f"{DEFAULT_FONT}-{'Bold' if bold else 'Regular'}.ttf"
+        bundled = _FONT_DIR / name
+        try:
+            _PIL_FONTS[key] = ImageFont.truetype(str(bundled) if bundled.exists() else name, size)
+        except OSError:
+            _PIL_FONTS[key] = ImageFont.load_default(size)
+    return _PIL_FONTS[key]
 
-    # Determine figure size
-    size = spec.get("size", [1200, 1200])
-    figsize = (size[0] / 150, size[1] / 150)
 
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.axis('tight')
-    ax.axis('off')
+def _create_table(spec: ChartSpec, palette: _Palette) -> Image.Image:
+    """
+    Create a table image.
 
-    # Create table
-    table_data = [columns] + rows
+    Drawn directly with Pillow: matplotlib's table artist allocates a Text
+    artist per cell and runs several layout passes, which dominates render
+    time for anything but tiny tables.
+    """
+    columns = [str(c) for c in spec.data.columns]
+    rows = [[str(c) for c in row] for row in spec.data.rows]
+    highlight_index = spec.highlight_index
+
+    cell_font = _load_font(TABLE_FONT_SIZE)
+    header_font = _load_font(TABLE_FONT_SIZE, bold=True)
+    title_font = _load_font(TABLE_TITLE_SIZE, bold=True)
+    source_font = _load_font(TABLE_SOURCE_SIZE)
+
+    # Measure every column once
+    col_widths = [int(header_font.getlength(col)) + 2 * TABLE_CELL_PAD for col in columns]
+    for row in rows:
+        for j, cell in enumerate(row[:len(col_widths)]):
+            col_widths[j] = max(col_widths[j], int(cell_font.getlength(cell)) + 2 * TABLE_CELL_PAD)
+
+    # Stretch columns to the requested width if the content is narrower
+    size = spec.size or (1200, 1200)
+    table_width = sum(col_widths)
+    available = size[0] - 2 * TABLE_MARGIN
+    if col_widths and table_width < available:
+        extra, remainder = divmod(available - table_width, len(col_widths))
+        col_widths = [w + extra for w in col_widths]
+        col_widths[-1] += remainder
+        table_width = available
+
+    row_height = TABLE_FONT_SIZE * 2 + TABLE_CELL_PAD
+    title_height = TABLE_TITLE_SIZE * 3
+    source_height = TABLE_SOURCE_SIZE * 3
+    width = table_width + 2 * TABLE_MARGIN
+    height = title_height + row_height * (len(rows) + 1) + source_height + TABLE_MARGIN
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
 
-    # Determine row colours
-    row_colours = []
-    # Header row
-    row_colours.append([colours.get("primary_dark_brown", "#47403F")] * len(columns))
+    # Title
+    title = spec.title or ""
+    draw.text((width // 2, title_height // 2), title, font=title_font, fill=palette.dark, anchor="mm")
 
-    # Data rows
-    for i in range(len(rows)):
+    # Header row, then data rows with alternating fill and optional highlight
+    table_rows = [(columns, palette.dark, "white", header_font)]
+    for i, row in enumerate(rows):
         if highlight_index is not None and i == highlight_index:
-            row_colours.append([colours.get("primary_gold", "#E8C07D")] * len(columns))
+            fill = palette.gold
         elif i % 2 == 0:
-            row_colours.append([colours.get("white", "#FFFFFF")] * len(columns))
+            fill = palette.white
         else:
-            row_colours.append([colours.get("secondary_linen", "#F7EFE4")] * len(columns))
-
-    table = ax.table(cellText=table_data, cellLoc='left', loc='center',
-                     cellColours=row_colours)
-
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.scale(1, 2)
-
-    # Style header row text (white)
-    for i in range(len(columns)):
-        cell = table[(0, i)]
-        cell.set_text_props(weight='bold', color='white')
-
-    # Title
-    title = spec.get("title", "")
-    fig.text(0.5, 0.95, title, ha='center', fontsize=14, fontweight='bold',
-             color=colours.get("primary_dark_brown", "#47403F"))
+            fill = palette.linen
+        table_rows.append((row, fill, "black", cell_font))
+
+    y = title_height
+    for cells, fill, text_colour, font in table_rows:
+        x = TABLE_MARGIN
+        for cell, col_width in zip(cells, col_widths):
+            draw.rectangle([x, y, x + col_width, y + row_height], fill=fill, outline="black")
+            draw.text((x + TABLE_CELL_PAD, y + row_height // 2), cell,
+                      font=font, fill=text_colour, anchor="lm")
+            x += col_width
+        y += row_height
 
     # Source
-    source = spec.get("source", "")
-    fig.text(0.95, 0.02, f"Source: {source}", ha='right', va='bottom',
-             fontsize=8, color='#666666')
+    draw.text((width - TABLE_MARGIN, height - TABLE_MARGIN // 2), f"Source: {spec.source or ''}",
+              font=source_font, fill="#666666", anchor="rb")
 
-    return fig
+    return image
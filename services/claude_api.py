@@ -8,36 +8,433 @@ Handles API calls to Anthropic's Claude for:
 - Weekly synthesis (Phase 1+)
 """
 
+import asyncio
 import os
+import re
+import json
 import logging
-from typing import Dict, List, Optional
-import anthropic
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+import orjson
+
+from utils.response_cache import cache_enabled, cache_key, get_cached, put_cached
 
 logger = logging.getLogger(__name__)
 
+# {{NAME}} placeholders used in the prompt files
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Marks where a prompt file's static instructions end and per-call content begins
+_DYNAMIC_START = "{{DYNAMIC_START}}"
+
+# Overall score bands used when merging per-transcript assessments
+# (the assessor marks anything under CONTENT_MIN_SCORE unsuitable for content)
+HIGH_QUALITY_SCORE = 7
+CONTENT_MIN_SCORE = 5
+
+# HTTP connection pool for the Anthropic client. Large enough that concurrent
+# content/assessment requests never queue for a connection.
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+CONNECT_TIMEOUT_SECONDS = 5.0
+REQUEST_TIMEOUT_SECONDS = 600.0  # The SDK default; long generations with web search can pause between chunks
+
+# SDK-level retries for transient failures (the SDK default is 2); backoff honours retry-after headers
+MAX_RETRIES = 5
+
+# Transcripts shorter than this (~500 tokens) with no comparative/trend language
+# count as "simple" and can be written by the cheaper model
+SIMPLE_MAX_CHARS = 2000
+_COMPLEX_TOPIC_RE = re.compile(
+    r"\b(compar\w*|trend\w*|versus|vs\.?|rank\w*|year[- ]over[- ]year|correlat\w*|historical)\b",
+    re.IGNORECASE
+)
+
+# Output token budgets. Responses are short JSON, so a tight max_tokens keeps
+# a runaway generation from running on for thousands of tokens.
+MAX_OUTPUT_TOKENS = 4096
+ASSESSMENT_MAX_TOKENS = 1024  # One transcript's assessment is a few hundred tokens
+QUESTION_BASE_TOKENS = 1024  # Commentary between web searches, before the JSON
+QUESTION_TOKENS_PER_PLAN = 512
+POST_OVERHEAD_TOKENS = 512  # JSON fields and chart spec around each post's copy
+CHARS_PER_TOKEN = 3  # Conservative, so post copy is never cut short
+
+# Number of transcripts beyond which a combined content request's token
+# allowance stops growing
+CONTENT_BATCH_TOKEN_CAP = 4
+
+# Appended to the content prompt when several transcripts share one request
+_CONTENT_BATCH_INSTRUCTIONS = """
+# MULTIPLE CONVERSATIONS
+The transcript above contains {count} separate conversations, numbered from 0.
+Write posts for each conversation independently, following every rule above.
+Instead of a single {{"posts": [...]}} object, return ONLY this JSON:
+{{"results": [{{"transcript_id": 0, "posts": [...]}}, {{"transcript_id": 1, "posts": [...]}}]}}
+with one entry per conversation.
+"""
+
+# JSON wrapped in a markdown code block
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+
+_BRAND_VOICE_RULES = """
+DO:
+- Lead with data, always
+- State things plainly: "yields fell 12%" not "yields experienced a significant decline"
+- Use comparisons: "roughly the output of the entire Australian almond industry"
+- Acknowledge limits: "the data shows X, though we don't have visibility into Y"
+- Credit sources including Demeter
+- Treat agriculture as serious global infrastructure
+
+DON'T:
+- Editorialise in data posts. No "finally", "surprisingly", "worryingly". Present the data.
+- Corporate language: "excited to share", "leverage", "synergy"
+- Emojis (none, ever)
+- Hashtags (none, ever)
+- Press release voice: "Demeter, the leading agricultural data provider"
+- Pretend certainty where there is none
+- Name competitors
+- "Disrupting" or "revolutionising"
+- "Genuinely", "honestly", "frankly"
+        """
+
+
+def _format_exchanges(exchanges: List[Dict]) -> str:
+    """Format transcript exchanges as Q/A pairs for a prompt."""
+    return "\n\n".join([f"Q: {ex['question']}\nA: {ex['response']}" for ex in exchanges])
+
+
+def classify_complexity(text: str) -> str:
+    """
+    Roughly classify how demanding a piece of content is to write.
+
+    Returns:
+        "simple" for short text without comparisons, rankings or trends,
+        otherwise "complex"
+    """
+    if len(text) < SIMPLE_MAX_CHARS and not _COMPLEX_TOPIC_RE.search(text):
+        return "simple"
+    return "complex"
+
+
+def _route_model(transcript_texts: List[str], model: str, model_simple: Optional[str]) -> str:
+    """Use model_simple (if set) when every formatted transcript classifies as simple, otherwise model."""
+    if model_simple and all(classify_complexity(text) == "simple" for text in transcript_texts):
+        return model_simple
+    return model
+
+
+@lru_cache(maxsize=1)
+def _http2_available() -> bool:
+    """Whether httpx can negotiate HTTP/2 (needs the optional h2 package)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _close_stale_client(client) -> None:
+    """
+    Close a client whose event loop has gone.
+
+    Its connections belong to the old loop, so closing them may fail; the
+    pool is dropped either way rather than left open for the process lifetime.
+    """
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Error closing client from a previous event loop: {e}")
+
+
+def _read_prompt(name: str) -> str:
+    """Read a prompt template from the prompts directory."""
+    with open(Path(__file__).parent.parent / "prompts" / name, 'r') as f:
+        return f.read()
+
+
+def _assessment_prompt(transcript: Dict, template: str) -> List[Dict]:
+    """Build the assessor prompt for a single transcript (the template expects a list)."""
+    transcripts_text = orjson.dumps([transcript], option=orjson.OPT_INDENT_2).decode()
+    return _prompt_blocks(template, static={}, dynamic={"TRANSCRIPTS": transcripts_text})
+
+
+def _merge_assessments(results: List[Dict]) -> Dict:
+    """
+    Merge per-transcript assessment results into a single result.
+
+    Assessments are concatenated and the summary is rebuilt from their
+    scores, in the same shape the assessor prompt returns.
+    """
+    assessments = [a for result in results for a in result.get("assessments", [])]
+    scores = [a.get("overall_score", 0) for a in assessments]
+    best = max(assessments, key=lambda a: a.get("overall_score", 0), default={})
+
+    def union(key: str) -> List[str]:
+        return list(dict.fromkeys(d for result in results for d in result.get("summary", {}).get(key, [])))
+
+    return {
+        "assessments": assessments,
+        "summary": {
+            "total_conversations": len(assessments),
+            "high_quality": sum(score >= HIGH_QUALITY_SCORE for score in scores),
+            "medium_quality": sum(CONTENT_MIN_SCORE <= score < HIGH_QUALITY_SCORE for score in scores),
+            "low_quality": sum(score < CONTENT_MIN_SCORE for score in scores),
+            "best_conversation_id": best.get("conversation_id"),
+            "domains_performing_well": union("domains_performing_well"),
+            "domains_with_gaps": union("domains_with_gaps"),
+        }
+    }
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON with orjson, falling back to the stdlib for inputs orjson rejects."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # Raises json.JSONDecodeError if the text really isn't JSON
+        return json.loads(text)
+
+
+def _parse_json_response(text: str, kind: str) -> Any:
+    """
+    Parse a JSON model response, tolerating a markdown code block or prose around it.
+
+    Args:
+        text: Raw text of the model response
+        kind: What the response is, for the error message
+
+    Returns:
+        Parsed JSON
+
+    Raises:
+        ValueError: If no JSON can be found in the response
+    """
+    try:
+        return _loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    if "```" in text:
+        json_match = _JSON_BLOCK_RE.search(text)
+        candidate = json_match.group(1) if json_match else None
+    else:
+        # No fences: take the outermost object, skipping the regex
+        start, end = text.find("{"), text.rfind("}")
+        candidate = text[start:end + 1] if 0 <= start < end else None
+
+    if candidate is not None:
+        try:
+            return _loads(candidate)
+        except json.JSONDecodeError:
+            pass
+    raise ValueError(f"Could not parse JSON from {kind} response")
+
+
+@lru_cache(maxsize=16)
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a {{NAME}} prompt template into fragments, once per template.
+
+    Even-indexed fragments are literal text and odd-indexed ones are
+    placeholder names, so rendering is a single join with no parsing.
+    """
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def _render(fragments: Tuple[str, ...], values: Dict[str, str]) -> str:
+    """Fill compiled template fragments; placeholders without a value are left as {{NAME}}."""
+    return "".join([
+        fragment if i % 2 == 0 else values.get(fragment, f"{{{{{fragment}}}}}")
+        for i, fragment in enumerate(fragments)
+    ])
+
+
+@lru_cache(maxsize=16)
+def _split_template(template: str, dynamic: FrozenSet[str]) -> Tuple[str, str]:
+    """
+    Split a template into its static prefix and dynamic suffix.
+
+    Splits at the {{DYNAMIC_START}} marker (dropping it) if present, otherwise
+    just before the first dynamic placeholder.
+    """
+    if _DYNAMIC_START in template:
+        prefix, suffix = template.split(_DYNAMIC_START, 1)
+        return prefix, suffix.lstrip("\n")
+    for match in _PLACEHOLDER_RE.finditer(template):
+        if match.group(1) in dynamic:
+            return template[:match.start()], template[match.start():]
+    return template, ""
+
+
+@lru_cache(maxsize=4)
+def _channel_specs_text(max_twitter: int, max_linkedin: int) -> str:
+    """Channel specs prompt text for the given character limits."""
+    return f"""
+Twitter: max {max_twitter} characters
+LinkedIn: max {max_linkedin} characters
+        """
+
+
+def _content_max_tokens(config: Dict) -> int:
+    """Output token budget for one transcript's posts: one post per channel, sized by its character limit."""
+    channels = config.get('channels', {})
+    limits = (
+        channels.get('twitter', {}).get('max_characters', 280),
+        channels.get('linkedin', {}).get('max_characters', 3000),
+    )
+    budget = sum(chars // CHARS_PER_TOKEN + POST_OVERHEAD_TOKENS for chars in limits)
+    return min(MAX_OUTPUT_TOKENS, budget)
+
+
+@lru_cache(maxsize=16)
+def _render_prefix(prefix: str, static: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a static prefix once per distinct set of static values."""
+    return _render(_compile_template(prefix), dict(static))
+
+
+def _prompt_blocks(template: str, static: Dict[str, str], dynamic: Dict[str, str]) -> List[Dict]:
+    """
+    Render a prompt template as message content blocks for prompt caching.
+
+    Everything before {{DYNAMIC_START}} (or the first dynamic placeholder) is
+    the same on every call, so it goes in its own block marked for caching;
+    the rest follows uncached.
+
+    Args:
+        template: Prompt template with {{NAME}} placeholders
+        static: Values that are the same across calls in a run
+        dynamic: Values that change per call
+
+    Returns:
+        Content blocks for a user message
+    """
+    prefix, suffix = _split_template(template, frozenset(dynamic))
+    blocks = []
+    if prefix.strip():
+        blocks.append({
+            "type": "text",
+            "text": _render_prefix(prefix, tuple(sorted(static.items()))),
+            "cache_control": {"type": "ephemeral"}
+        })
+    if suffix:
+        blocks.append({"type": "text", "text": _render(_compile_template(suffix), {**static, **dynamic})})
+    return blocks
+
 
 class ClaudeAPI:
     """Wrapper for Anthropic Claude API calls."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_retries: int = MAX_RETRIES):
         """
         Initialize Claude API client.
 
         Args:
             api_key: Anthropic API key. If None, reads from ANTHROPIC_API_KEY env var
+            max_retries: Retries for rate-limited (429), overloaded (529), server-error
+                and connection/timeout failures, with exponential backoff and jitter
         """
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment or constructor")
+        self.max_retries = max_retries
+
+        # Async client, created per event loop (see the client property)
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Background closes of clients left behind by an earlier loop
+        self._closing: Set[asyncio.Task] = set()
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Prompt templates, read once per instance rather than on every call
+        self._question_template = _read_prompt("question_generator.txt")
+        self._assessor_template = _read_prompt("response_assessor.txt")
 
-    def generate_content(
+    @property
+    def client(self):
+        """
+        Async Anthropic client for the running event loop.
+
+        Requests share one pooled, keep-alive connection pool (HTTP/2 when the
+        h2 package is installed). The pool is tied to the loop it was first used on,
+        so a new client is created when called from a different loop (e.g. a
+        later asyncio.run), and the stale client's pool is closed in the
+        background. Must be accessed from inside a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                task = loop.create_task(_close_stale_client(self._client))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+            # Imported here rather than at module load; anthropic pulls in httpx and pydantic
+            import anthropic
+            import httpx
+
+            http_client = anthropic.DefaultAsyncHttpxClient(
+                http2=_http2_available(),
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+                timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+            )
+            self._client = anthropic.AsyncAnthropic(
+                api_key=self.api_key, http_client=http_client, max_retries=self.max_retries
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def close(self):
+        """Close the client (and its connection pool), including one left over from an earlier loop."""
+        if self._client is not None:
+            if self._client_loop is asyncio.get_running_loop():
+                await self._client.close()
+            else:
+                await _close_stale_client(self._client)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+        self._client = None
+        self._client_loop = None
+
+    async def _complete(self, model: str, prompt: List[Dict], max_tokens: int = MAX_OUTPUT_TOKENS, **params) -> str:
+        """
+        Send a single-turn request and return the streamed response text.
+
+        With CLAUDE_CACHE=1, responses are served from and saved to the
+        on-disk response cache (see utils.response_cache).
+
+        Args:
+            model: Claude model to use
+            prompt: User message content blocks
+            max_tokens: Maximum tokens to generate
+            **params: Extra request parameters (e.g. tools)
+
+        Returns:
+            The response's text, joined across text blocks
+        """
+        request = {"max_tokens": max_tokens, "messages": [{"role": "user", "content": prompt}], **params}
+
+        key = None
+        if cache_enabled():
+            key = cache_key(model, request)
+            cached = get_cached(key)
+            if cached is not None:
+                logger.info(f"Using cached {model} response")
+                return cached
+
+        # Streamed so text arrives as it is generated rather than in one final read
+        async with self.client.messages.stream(model=model, **request) as stream:
+            content_text = "".join([text async for text in stream.text_stream])
+
+        if key is not None:
+            await asyncio.to_thread(put_cached, key, content_text)
+        return content_text
+
+    async def generate_content(
         self,
         transcript: Dict,
         config: Dict,
         prompt_template: str,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-sonnet-4-20250514",
+        model_simple: Optional[str] = None
     ) -> Dict:
         """
         Generate social media content from a conversation transcript.
@@ -47,56 +444,116 @@ class ClaudeAPI:
             config: Configuration dict
             prompt_template: Prompt template content
             model: Claude model to use
+            model_simple: Cheaper model for simple transcripts (see classify_complexity).
+                If None, model is always used.
 
         Returns:
             Generated content structure with posts and chart specs
         """
+        # Formatted once and shared by routing and the prompt
+        transcript_text = _format_exchanges(transcript.get('exchanges', []))
+        model = _route_model([transcript_text], model, model_simple)
         logger.info(f"Generating content with {model}")
 
         # Build the prompt
-        prompt = self._build_content_prompt(transcript, config, prompt_template)
+        prompt = self._build_content_prompt(transcript, config, prompt_template, transcript_text)
 
         try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            content_text = await self._complete(model, prompt, max_tokens=_content_max_tokens(config))
+            return self._parse_content_response(content_text)
 
-            # Extract the text content
-            content_text = response.content[0].text
+        except Exception as e:
+            logger.error(f"Error calling Claude API: {e}")
+            raise
 
-            # Parse the JSON response
-            import json
-            try:
-                result = json.loads(content_text)
-            except json.JSONDecodeError:
-                # If response isn't pure JSON, try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```json\s*(.*?)\s*```', content_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    # Fallback: create a simple post
-                    logger.warning("Could not parse JSON from response, creating fallback")
-                    result = {
-                        "posts": [{
-                            "channel": "linkedin",
-                            "copy": content_text[:3000],
-                            "format_type": "data_snippet"
-                        }]
-                    }
-
-            logger.info(f"Generated {len(result.get('posts', []))} posts")
-            return result
+    async def generate_content_batch(
+        self,
+        transcripts: List[Dict],
+        config: Dict,
+        prompt_template: str,
+        model: str = "claude-sonnet-4-20250514",
+        model_simple: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Generate content for several transcripts in a single request.
+
+        The prompt instructions are sent once for the whole group, and the
+        response is split back out by transcript_id.
+
+        Args:
+            transcripts: Conversation transcripts with exchanges
+            config: Configuration dict
+            prompt_template: Prompt template content
+            model: Claude model to use
+            model_simple: Cheaper model, used if every transcript is simple
 
+        Returns:
+            Generated content structure per transcript, in input order. A
+            transcript the response skipped gets no posts.
+        """
+        transcript_texts = [_format_exchanges(t.get('exchanges', [])) for t in transcripts]
+        model = _route_model(transcript_texts, model, model_simple)
+        logger.info(f"Generating content for {len(transcripts)} transcripts in one request with {model}")
+
+        prompt = self._build_content_batch_prompt(transcripts, config, prompt_template, transcript_texts)
+        max_tokens = _content_max_tokens(config) * min(len(transcripts), CONTENT_BATCH_TOKEN_CAP)
+
+        try:
+            content_text = await self._complete(model, prompt, max_tokens=max_tokens)
         except Exception as e:
             logger.error(f"Error calling Claude API: {e}")
             raise
 
-    def _build_content_prompt(self, transcript: Dict, config: Dict, template: str) -> str:
+        result = _parse_json_response(content_text, "batched content")
+        by_id = {}
+        for entry in result.get("results", []):
+            # The model may send the id as a string ("0")
+            try:
+                transcript_id = int(entry.get("transcript_id"))
+            except (TypeError, ValueError):
+                logger.warning(f"Skipping batched content result with invalid transcript_id: {entry.get('transcript_id')!r}")
+                continue
+            by_id[transcript_id] = {"posts": entry.get("posts", [])}
+
+        missing = [i for i in range(len(transcripts)) if i not in by_id]
+        if missing:
+            logger.warning(f"Batched content response had no results for transcripts {missing}")
+
+        return [by_id.get(i, {"posts": []}) for i in range(len(transcripts))]
+
+    def _parse_content_response(self, content_text: str) -> Dict:
+        """
+        Parse the content generation response into posts.
+
+        Args:
+            content_text: Raw text of the model response
+
+        Returns:
+            Generated content structure with posts and chart specs
+        """
+        try:
+            result = _parse_json_response(content_text, "content")
+        except ValueError:
+            # Fallback: create a simple post
+            logger.warning("Could not parse JSON from response, creating fallback")
+            result = {
+                "posts": [{
+                    "channel": "linkedin",
+                    "copy": content_text[:3000],
+                    "format_type": "data_snippet"
+                }]
+            }
+
+        logger.info(f"Generated {len(result.get('posts', []))} posts")
+        return result
+
+    def _build_content_prompt(
+        self,
+        transcript: Dict,
+        config: Dict,
+        template: str,
+        transcript_text: Optional[str] = None
+    ) -> List[Dict]:
         """
         Build the content generation prompt from template and context.
 
@@ -104,63 +561,71 @@ class ClaudeAPI:
             transcript: Conversation transcript
             config: Configuration dict
             template: Prompt template
+            transcript_text: The transcript's exchanges already formatted, if the caller has them
 
         Returns:
-            Complete prompt string
+            Prompt content blocks, with the static prefix marked for caching
         """
-        # Format the transcript for the prompt
-        exchanges_text = "\n\n".join([
-            f"Q: {ex['question']}\nA: {ex['response']}"
-            for ex in transcript.get('exchanges', [])
-        ])
-
-        # Replace placeholders in template
-        prompt = template.replace("{{TOPIC}}", transcript.get('topic', 'Unknown'))
-        prompt = prompt.replace("{{TRANSCRIPT}}", exchanges_text)
-        prompt = prompt.replace("{{BRAND_VOICE}}", self._get_brand_voice_rules())
-        prompt = prompt.replace("{{CHANNEL_SPECS}}", self._format_channel_specs(config))
-
-        return prompt
+        return _prompt_blocks(
+            template,
+            static={
+                "BRAND_VOICE": _BRAND_VOICE_RULES,
+                "CHANNEL_SPECS": self._format_channel_specs(config),
+            },
+            dynamic={
+                "TOPIC": transcript.get('topic', 'Unknown'),
+                "TRANSCRIPT": transcript_text if transcript_text is not None else _format_exchanges(transcript.get('exchanges', [])),
+            },
+        )
 
-    def _get_brand_voice_rules(self) -> str:
-        """Get brand voice rules as formatted text."""
-        return """
-DO:
-- Lead with data, always
-- State things plainly: "yields fell 12%" not "yields experienced a significant decline"
-- Use comparisons: "roughly the output of the entire Australian almond industry"
-- Acknowledge limits: "the data shows X, though we don't have visibility into Y"
-- Credit sources including Demeter
-- Treat agriculture as serious global infrastructure
+    def _build_content_batch_prompt(
+        self,
+        transcripts: List[Dict],
+        config: Dict,
+        template: str,
+        transcript_texts: List[str]
+    ) -> List[Dict]:
+        """
+        Build one content prompt covering several transcripts.
 
-DON'T:
-- Editorialise in data posts. No "finally", "surprisingly", "worryingly". Present the data.
-- Corporate language: "excited to share", "leverage", "synergy"
-- Emojis (none, ever)
-- Hashtags (none, ever)
-- Press release voice: "Demeter, the leading agricultural data provider"
-- Pretend certainty where there is none
-- Name competitors
-- "Disrupting" or "revolutionising"
-- "Genuinely", "honestly", "frankly"
+        The static prefix is identical to the single-transcript prompt, so
+        both share the same prompt cache entry. transcript_texts holds each
+        transcript's formatted exchanges, in the same order.
         """
+        sections = [
+            f"## Conversation {i}: {t.get('topic', 'Unknown')}\n\n{text}"
+            for i, (t, text) in enumerate(zip(transcripts, transcript_texts))
+        ]
+        blocks = _prompt_blocks(
+            template,
+            static={
+                "BRAND_VOICE": _BRAND_VOICE_RULES,
+                "CHANNEL_SPECS": self._format_channel_specs(config),
+            },
+            dynamic={
+                "TOPIC": "; ".join(t.get('topic', 'Unknown') for t in transcripts),
+                "TRANSCRIPT": "\n\n".join(sections),
+            },
+        )
+        blocks.append({"type": "text", "text": _CONTENT_BATCH_INSTRUCTIONS.format(count=len(transcripts))})
+        return blocks
 
     def _format_channel_specs(self, config: Dict) -> str:
         """Format channel specifications for prompt."""
         channels = config.get('channels', {})
-        return f"""
-Twitter: max {channels.get('twitter', {}).get('max_characters', 280)} characters
-LinkedIn: max {channels.get('linkedin', {}).get('max_characters', 3000)} characters
-        """
+        return _channel_specs_text(
+            channels.get('twitter', {}).get('max_characters', 280),
+            channels.get('linkedin', {}).get('max_characters', 3000)
+        )
 
-    def generate_questions(
+    async def generate_questions(
         self,
         config: Dict,
         coverage_manifest: Dict,
         scan_results: List[Dict],
         recent_topics: List[str],
         num_conversations: int = 3,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-haiku-4-5-20251001"
     ) -> List[Dict]:
         """
         Generate conversation plans for interrogating the Demeter AI.
@@ -178,44 +643,25 @@ LinkedIn: max {channels.get('linkedin', {}).get('max_characters', 3000)} charact
         """
         logger.info(f"Generating {num_conversations} conversation plans with {model} (web search enabled)")
 
-        # Load the question generator prompt
-        from pathlib import Path
-        prompt_path = Path(__file__).parent.parent / "prompts" / "question_generator.txt"
-        with open(prompt_path, 'r') as f:
-            template = f.read()
-
         # Build the prompt
         prompt = self._build_question_prompt(
-            template, config, coverage_manifest, scan_results, recent_topics, num_conversations
+            self._question_template, config, coverage_manifest, scan_results, recent_topics, num_conversations
         )
 
         try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=4096,
+            content_text = await self._complete(
+                model,
+                prompt,
+                max_tokens=min(MAX_OUTPUT_TOKENS, QUESTION_BASE_TOKENS + QUESTION_TOKENS_PER_PLAN * num_conversations),
                 tools=[{
                     "type": "web_search_20250305",
                     "name": "web_search",
                     "max_uses": 10
-                }],  # Enable web search
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+                }]  # Enable web search
             )
 
             # Parse JSON response
-            import json
-            import re
-            content_text = response.content[0].text
-
-            try:
-                result = json.loads(content_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'```json\s*(.*?)\s*```', content_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise ValueError("Could not parse JSON from question generation response")
+            result = _parse_json_response(content_text, "question generation")
 
             plans = result.get("conversation_plans", [])
             logger.info(f"Generated {len(plans)} conversation plans")
@@ -233,9 +679,8 @@ LinkedIn: max {channels.get('linkedin', {}).get('max_characters', 3000)} charact
         scan_results: List[Dict],
         recent_topics: List[str],
         num_conversations: int
-    ) -> str:
-        """Build the question generation prompt."""
-        import json
+    ) -> List[Dict]:
+        """Build the question generation prompt as content blocks (static prefix cached)."""
 
         # Format news summary
         if scan_results:
@@ -251,69 +696,135 @@ LinkedIn: max {channels.get('linkedin', {}).get('max_characters', 3000)} charact
 
         # Format format mix
         format_mix = config.get('format_mix', {})
-        format_text = json.dumps(format_mix, indent=2)
-
-        # Replace placeholders
-        prompt = template.replace("{{NEWS_SUMMARY}}", news_summary)
-        prompt = prompt.replace("{{RECENT_TOPICS}}", topics_text)
-        prompt = prompt.replace("{{FORMAT_MIX}}", format_text)
-        prompt = prompt.replace("{{NUM_CONVERSATIONS}}", str(num_conversations))
+        format_text = orjson.dumps(format_mix, option=orjson.OPT_INDENT_2).decode()
 
-        return prompt
+        return _prompt_blocks(
+            template,
+            static={"FORMAT_MIX": format_text, "NUM_CONVERSATIONS": str(num_conversations)},
+            dynamic={"NEWS_SUMMARY": news_summary, "RECENT_TOPICS": topics_text},
+        )
 
-    def assess_responses(
+    async def assess_responses(
         self,
         transcripts: List[Dict],
-        model: str = "claude-haiku-4-5-20251001"
+        model: str = "claude-haiku-4-5-20251001",
+        max_concurrent: int = 5
     ) -> Dict:
         """
         Assess quality of Demeter AI responses from conversation transcripts.
 
+        Each transcript is assessed in its own request, at most max_concurrent
+        at a time, and the results are merged into one assessment.
+
         Args:
             transcripts: List of conversation transcripts
             model: Claude model to use (Haiku for cheap classification)
+            max_concurrent: Maximum assessment requests in flight at once
 
         Returns:
             Assessment results with scores and recommendations
         """
         logger.info(f"Assessing {len(transcripts)} conversation transcripts with {model}")
 
-        # Load the assessor prompt
-        from pathlib import Path
-        prompt_path = Path(__file__).parent.parent / "prompts" / "response_assessor.txt"
-        with open(prompt_path, 'r') as f:
-            template = f.read()
+        template = self._assessor_template
 
-        # Format transcripts for prompt
-        import json
-        transcripts_text = json.dumps(transcripts, indent=2)
-        prompt = template.replace("{{TRANSCRIPTS}}", transcripts_text)
+        sem = asyncio.Semaphore(max_concurrent)
 
-        try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        async def assess_one(transcript: Dict) -> Dict:
+            async with sem:
+                return await self._assess_one(transcript, template, model)
 
-            # Parse JSON response
-            import re
-            content_text = response.content[0].text
+        results = await asyncio.gather(*[assess_one(t) for t in transcripts], return_exceptions=True)
 
-            try:
-                result = json.loads(content_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'```json\s*(.*?)\s*```', content_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise ValueError("Could not parse JSON from assessment response")
+        assessed = []
+        for transcript, result in zip(transcripts, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error assessing {transcript.get('conversation_id', 'unknown')}: {result}")
+            else:
+                assessed.append(result)
 
-            logger.info(f"Assessed {len(result.get('assessments', []))} conversations")
-            return result
+        if transcripts and not assessed:
+            # Nothing could be assessed - surface the first error as before
+            raise results[0]
 
-        except Exception as e:
-            logger.error(f"Error assessing responses: {e}")
-            raise
+        merged = _merge_assessments(assessed)
+        logger.info(f"Assessed {len(merged['assessments'])} conversations")
+        return merged
+
+    async def _assess_one(self, transcript: Dict, template: str, model: str) -> Dict:
+        """Assess a single transcript."""
+        content_text = await self._complete(
+            model, _assessment_prompt(transcript, template), max_tokens=ASSESSMENT_MAX_TOKENS, temperature=0
+        )
+        return _parse_json_response(content_text, "assessment")
+
+    async def assess_responses_batch(
+        self,
+        transcripts: List[Dict],
+        model: str = "claude-haiku-4-5-20251001",
+        poll_interval: int = 30,
+        max_wait: int = 3600
+    ) -> Dict:
+        """
+        Assess transcripts through the Message Batches API.
+
+        Batched requests cost half as much and don't count against per-minute
+        rate limits, but complete in minutes rather than seconds - fine for
+        unattended runs. One request is submitted per transcript and the
+        results are merged as in assess_responses.
+
+        Args:
+            transcripts: List of conversation transcripts
+            model: Claude model to use (Haiku for cheap classification)
+            poll_interval: Seconds between batch status checks
+            max_wait: Seconds to wait for the batch before cancelling it
+
+        Returns:
+            Assessment results with scores and recommendations
+
+        Raises:
+            TimeoutError: If the batch hasn't finished within max_wait
+        """
+        logger.info(f"Submitting batch assessment of {len(transcripts)} transcripts with {model}")
+
+        template = self._assessor_template
+        batch = await self.client.messages.batches.create(requests=[
+            {
+                "custom_id": f"tr_{i}",
+                "params": {
+                    "model": model,
+                    "max_tokens": ASSESSMENT_MAX_TOKENS,
+                    "temperature": 0,
+                    "messages": [
+                        {"role": "user", "content": _assessment_prompt(transcript, template)}
+                    ]
+                }
+            }
+            for i, transcript in enumerate(transcripts)
+        ])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while batch.processing_status != "ended":
+            if loop.time() >= deadline:
+                await self.client.messages.batches.cancel(batch.id)
+                raise TimeoutError(f"Assessment batch {batch.id} did not finish within {max_wait}s")
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+            logger.debug(f"Assessment batch {batch.id}: {batch.processing_status}")
+
+        results_by_id = {}
+        async for entry in await self.client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                logger.error(f"Batch assessment {entry.custom_id} {entry.result.type}")
+                continue
+            try:
+                results_by_id[entry.custom_id] = _parse_json_response(entry.result.message.content[0].text, "assessment")
+            except ValueError as e:
+                logger.error(f"Batch assessment {entry.custom_id}: {e}")
+
+        merged = _merge_assessments([
+            results_by_id[f"tr_{i}"] for i in range(len(transcripts)) if f"tr_{i}" in results_by_id
+        ])
+        logger.info(f"Assessed {len(merged['assessments'])} conversations")
+        return merged
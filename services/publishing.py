@@ -5,13 +5,22 @@ For Phase 0, this is a STUB that prints output to console and saves to files.
 Phase 2 will implement real Typefully API integration.
 """
 
-import json
+import asyncio
 import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+import orjson
+from aiolimiter import AsyncLimiter
 
 logger = logging.getLogger(__name__)
 
+# Fills in a rate_limits entry that gives only one of max_rate / period_seconds.
+# Channels without an entry aren't limited: the stub only writes local files.
+DEFAULT_RATE_LIMIT = {"max_rate": 10, "period_seconds": 60}
+
 
 def publish(posts: List[Dict], config: Dict, run_id: str) -> Dict:
     """
@@ -27,37 +36,55 @@ def publish(posts: List[Dict], config: Dict, run_id: str) -> Dict:
     Returns:
         Publishing summary with status for each post
     """
+    return asyncio.run(publish_many(posts, config, run_id))
+
+
+async def publish_many(posts: List[Dict], config: Dict, run_id: str) -> Dict:
+    """
+    Publish posts with each channel handled concurrently.
+
+    Channels don't share rate-limit state, so each channel's posts are
+    published on their own task behind that channel's own limiter.
+
+    Args:
+        posts: List of posts to publish, each with channel, copy, chart_path
+        config: Configuration dict
+        run_id: Unique run identifier
+
+    Returns:
+        Publishing summary with status for each post (ordered by post_index)
+    """
     logger.info(f"Phase 4 (PUBLISH - STUB): Processing {len(posts)} posts")
 
     output_dir = Path("output")
     output_dir.mkdir(parents=True, exist_ok=True)
+    dir_fd = _open_dir(output_dir)
 
-    results = []
-
+    # Group posts by channel, keeping their original index
+    by_channel: Dict[str, List[Tuple[int, Dict]]] = defaultdict(list)
     for i, post in enumerate(posts):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"POST {i+1}/{len(posts)} - {post.get('channel', 'unknown').upper()}")
-        logger.info(f"{'='*60}")
-        logger.info(f"Format: {post.get('format_type', 'unknown')}")
-        logger.info(f"\nCopy:\n{post.get('copy', '')}")
-
-        if post.get('chart_path'):
-            logger.info(f"\nChart: {post['chart_path']}")
-
-        logger.info(f"{'='*60}\n")
-
-        # Save post to JSON file
-        post_file = output_dir / f"{run_id}_post_{i+1}.json"
-        with open(post_file, 'w') as f:
-            json.dump(post, f, indent=2)
-
-        results.append({
-            "post_index": i,
-            "status": "saved_to_file",
-            "file": str(post_file),
-            "channel": post.get('channel'),
-            "has_chart": bool(post.get('chart_path'))
-        })
+        by_channel[post.get('channel', 'unknown')].append((i, post))
+
+    rate_limits = config.get("publishing", {}).get("rate_limits", {})
+    try:
+        # Let every channel settle before closing dir_fd, so no write is still using it
+        channel_results = await asyncio.gather(*[
+            _publish_channel(channel_posts, len(posts), output_dir, dir_fd, run_id,
+                             _channel_limiter(rate_limits.get(channel)))
+            for channel, channel_posts in by_channel.items()
+        ], return_exceptions=True)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    for channel_result in channel_results:
+        if isinstance(channel_result, BaseException):
+            raise channel_result
+
+    results = sorted(
+        (result for channel_result in channel_results for result in channel_result),
+        key=lambda r: r["post_index"]
+    )
 
     summary = {
         "total_posts": len(posts),
@@ -68,3 +95,113 @@ def publish(posts: List[Dict], config: Dict, run_id: str) -> Dict:
 
     logger.info(f"Published {len(results)} posts (saved to output/ directory)")
     return summary
+
+
+def _open_dir(path: Path) -> Optional[int]:
+    """
+    Open a directory for dir_fd-relative writes.
+
+    Returns:
+        The directory's file descriptor, or None where dir_fd isn't supported (e.g. Windows)
+    """
+    if os.open not in os.supports_dir_fd or not hasattr(os, "O_DIRECTORY"):
+        return None
+    return os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+
+
+def _write_at(dir_fd: int, name: str, data: bytes) -> None:
+    """Write data to name inside the directory dir_fd, without resolving the directory path again."""
+    fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _channel_limiter(rate_limit: Optional[Dict]) -> Optional[AsyncLimiter]:
+    """Build a token-bucket limiter from a {max_rate, period_seconds} config entry (None if not configured)."""
+    if not rate_limit:
+        return None
+    return AsyncLimiter(
+        rate_limit.get("max_rate", DEFAULT_RATE_LIMIT["max_rate"]),
+        rate_limit.get("period_seconds", DEFAULT_RATE_LIMIT["period_seconds"])
+    )
+
+
+async def _publish_channel(
+    channel_posts: List[Tuple[int, Dict]],
+    total_posts: int,
+    output_dir: Path,
+    dir_fd: Optional[int],
+    run_id: str,
+    limiter: Optional[AsyncLimiter]
+) -> List[Dict]:
+    """
+    Publish one channel's posts in order, respecting the channel's rate limit.
+
+    Posts are released in order by the limiter (if the channel has one);
+    their file writes then run in worker threads and overlap with the rest
+    of the channel.
+    """
+    tasks = []
+    for i, post in channel_posts:
+        if limiter is not None:
+            await limiter.acquire()
+        tasks.append(asyncio.create_task(_publish_post(i, post, total_posts, output_dir, dir_fd, run_id)))
+
+    # Wait for every write to finish (the caller closes dir_fd after), then surface the first failure
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return list(results)
+
+
+async def _publish_post(
+    i: int,
+    post: Dict,
+    total_posts: int,
+    output_dir: Path,
+    dir_fd: Optional[int],
+    run_id: str
+) -> Dict:
+    """
+    Publish a single post.
+
+    STUB: prints to console and saves the post as JSON in output/.
+
+    Returns:
+        Result entry for the publishing summary
+    """
+    # One record per post, so concurrent channels can't interleave their banners
+    if logger.isEnabledFor(logging.INFO):
+        rule = "=" * 60
+        chart = f"\nChart: {post['chart_path']}\n" if post.get('chart_path') else ""
+        logger.info(
+            f"\n{rule}\n"
+            f"POST {i+1}/{total_posts} - {post.get('channel', 'unknown').upper()}\n"
+            f"{rule}\n"
+            f"Format: {post.get('format_type', 'unknown')}\n"
+            f"\nCopy:\n{post.get('copy', '')}\n"
+            f"{chart}"
+            f"{rule}\n"
+        )
+
+    # Save post to JSON file
+    post_name = f"{run_id}_post_{i+1}.json"
+    post_file = output_dir / post_name
+    data = orjson.dumps(post, option=orjson.OPT_INDENT_2)
+    if dir_fd is not None:
+        await asyncio.to_thread(_write_at, dir_fd, post_name, data)
+    else:
+        await asyncio.to_thread(post_file.write_bytes, data)
+
+    return {
+        "post_index": i,
+        "status": "saved_to_file",
+        "file": str(post_file),
+        "channel": post.get('channel'),
+        "has_chart": bool(post.get('chart_path'))
+    }
@@ -0,0 +1,20 @@
+"""Tests for batched answer splitting in services/browser.py."""
+
+from services.browser import _split_batch_response
+
+
+def test_split_batch_response_in_order():
+    response = "Preamble.\n[Q1]: First answer.\n\n[Q2]: Second answer.\n[Q3]:Third."
+
+    assert _split_batch_response(response, 3) == ["First answer.", "Second answer.", "Third."]
+
+
+def test_split_batch_response_out_of_order_keeps_first():
+    response = "[Q2]: Second.\n[Q1]: First.\n[Q2]: Repeated."
+
+    assert _split_batch_response(response, 2) == ["First.", "Second."]
+
+
+def test_split_batch_response_missing_marker():
+    assert _split_batch_response("[Q1]: Only one.", 2) is None
+    assert _split_batch_response("No markers at all.", 1) is None
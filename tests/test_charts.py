@@ -0,0 +1,35 @@
+"""Tests for chart spec validation in services/charts.py."""
+
+import msgspec
+
+from services.charts import ChartSpec, generate_chart
+
+
+def test_spec_accepts_null_optional_fields():
+    spec = msgspec.convert({
+        "type": "line",
+        "title": None,
+        "source": None,
+        "data": {
+            "labels": ["2023", "2024"],
+            "values": [1.0, 2.0],
+            "comparison_values": [1.5, 2.5],
+            "series_name": None,
+            "comparison_series_name": None,
+        },
+    }, ChartSpec, strict=False)
+
+    assert spec.title is None
+    assert spec.data.series_name is None
+    assert spec.data.comparison_series_name is None
+
+
+def test_generate_chart_with_null_series_names(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = generate_chart({
+        "type": "vertical_bar",
+        "title": None,
+        "data": {"labels": ["A", "B"], "values": [3, 4], "series_name": None},
+    }, {}, "null_fields")
+
+    assert (tmp_path / path).exists()
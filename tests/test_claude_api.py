@@ -0,0 +1,54 @@
+"""Tests for response parsing and assessment merging in services/claude_api.py."""
+
+import pytest
+
+from services.claude_api import _merge_assessments, _parse_json_response
+
+
+def test_merge_assessments_rebuilds_summary():
+    merged = _merge_assessments([
+        {
+            "assessments": [{"conversation_id": "a", "overall_score": 8}],
+            "summary": {"domains_performing_well": ["wheat"], "domains_with_gaps": ["soy"]},
+        },
+        {
+            "assessments": [
+                {"conversation_id": "b", "overall_score": 5},
+                {"conversation_id": "c", "overall_score": 2},
+            ],
+            "summary": {"domains_performing_well": ["wheat", "corn"], "domains_with_gaps": []},
+        },
+    ])
+
+    assert [a["conversation_id"] for a in merged["assessments"]] == ["a", "b", "c"]
+    assert merged["summary"] == {
+        "total_conversations": 3,
+        "high_quality": 1,
+        "medium_quality": 1,
+        "low_quality": 1,
+        "best_conversation_id": "a",
+        "domains_performing_well": ["wheat", "corn"],
+        "domains_with_gaps": ["soy"],
+    }
+
+
+def test_merge_assessments_empty():
+    merged = _merge_assessments([{}])
+
+    assert merged["assessments"] == []
+    assert merged["summary"]["total_conversations"] == 0
+    assert merged["summary"]["best_conversation_id"] is None
+
+
+@pytest.mark.parametrize("text", [
+    '{"posts": [1, 2]}',
+    'Here you go:\n```json\n{"posts": [1, 2]}\n```\nLet me know.',
+    'Sure, the result is {"posts": [1, 2]} as requested.',
+])
+def test_parse_json_response_formats(text):
+    assert _parse_json_response(text, "content") == {"posts": [1, 2]}
+
+
+def test_parse_json_response_without_json():
+    with pytest.raises(ValueError, match="content"):
+        _parse_json_response("No JSON here.", "content")
@@ -0,0 +1,49 @@
+"""Tests for the JSON sidecar in utils/yaml_cache.py."""
+
+import json
+import os
+
+from utils import yaml_cache
+
+
+def _load_fresh(path):
+    # Clear the in-memory cache so the load goes through the sidecar path
+    yaml_cache._CACHE.clear()
+    return yaml_cache.load_yaml_cached(str(path))
+
+
+def test_sidecar_round_trip(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("brand:\n  name: Demeter\nvolumes: [1, 2]\n")
+
+    data = _load_fresh(path)
+    sidecar = json.loads((tmp_path / "config.yaml.json").read_text())
+    stat = os.stat(path)
+
+    assert data == {"brand": {"name": "Demeter"}, "volumes": [1, 2]}
+    assert sidecar == {"source": [stat.st_mtime_ns, stat.st_size], "data": data}
+
+    # A matching sidecar is used in place of the YAML
+    sidecar["data"] = {"from": "sidecar"}
+    (tmp_path / "config.yaml.json").write_text(json.dumps(sidecar))
+    assert _load_fresh(path) == {"from": "sidecar"}
+
+
+def test_stale_sidecar_is_ignored(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n")
+    _load_fresh(path)
+
+    path.write_text("a: 22\n")
+
+    assert _load_fresh(path) == {"a": 22}
+
+
+def test_sidecar_skipped_for_non_json_data(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("2024: launched\nstart: 2024-01-01\n")
+
+    data = _load_fresh(path)
+
+    assert 2024 in data
+    assert not (tmp_path / "config.yaml.json").exists()
@@ -0,0 +1,60 @@
+"""
+Disk cache for Claude API responses, for repeated development runs.
+
+Enabled only when CLAUDE_CACHE=1, so production runs never see stale
+responses. Entries are keyed by a SHA-256 of the model and the full
+request (prompt blocks and any tools), and hold the raw response text;
+callers parse it exactly as they would a live response.
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(".cache/claude_api")
+
+
+def cache_enabled() -> bool:
+    """Whether response caching is switched on for this process."""
+    return os.environ.get("CLAUDE_CACHE") == "1"
+
+
+def cache_key(model: str, request: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a request.
+
+    Args:
+        model: Claude model name
+        request: Request parameters other than the model (messages, tools, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    body = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(model.encode() + b"\0" + body).hexdigest()
+
+
+def get_cached(key: str) -> Optional[str]:
+    """Return the cached response text for key, or None on a miss."""
+    try:
+        return (CACHE_DIR / f"{key}.txt").read_bytes().decode()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Ignoring unreadable response cache entry {key}: {e}")
+        return None
+
+
+def put_cached(key: str, text: str) -> None:
+    """Store response text under key."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"{key}.txt").write_bytes(text.encode())
+    except OSError as e:
+        logger.warning(f"Could not write response cache entry {key}: {e}")
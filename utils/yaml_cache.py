@@ -0,0 +1,102 @@
+"""
+Cached YAML loading for configuration files.
+
+Parsed YAML is cached in memory keyed by (path, mtime, size), so repeated
+loads of an unchanged file skip PyYAML parsing entirely. Across processes,
+a JSON sidecar (e.g. coverage_manifest.yaml.json) is written next to each
+YAML file and loaded instead while the YAML's mtime and size still match
+the ones recorded in the sidecar.
+"""
+
+import copy
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of parsed files kept in memory
+MAX_CACHE_ENTRIES = 100
+
+# path -> (mtime, size, parsed data)
+_CACHE: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+
+
+def load_yaml_cached(path: str) -> Dict:
+    """
+    Load a YAML file, reusing the parsed result if the file is unchanged.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Deep copy of the parsed YAML data (safe for callers to mutate)
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    cached = _CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        _CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    data = _load_yaml_or_sidecar(key, stat)
+
+    _CACHE[key] = (stat.st_mtime, stat.st_size, data)
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > MAX_CACHE_ENTRIES:
+        _CACHE.popitem(last=False)
+
+    return copy.deepcopy(data)
+
+
+def _load_yaml_or_sidecar(path: str, yaml_stat: os.stat_result) -> Dict:
+    """
+    Load parsed data from the JSON sidecar if it matches the YAML, otherwise parse the YAML.
+
+    The sidecar records the (mtime, size) of the YAML it was built from and
+    is only used while both still match, so a YAML replaced by an older
+    revision (cp -p, rsync -a, git checkout) isn't shadowed by a stale
+    sidecar. A sidecar is only written if the data survives a JSON round
+    trip unchanged: YAML dates, or non-string keys such as 2024: or true:,
+    mean no sidecar for that file.
+
+    Args:
+        path: Absolute path to the YAML file
+        yaml_stat: os.stat() of the YAML file
+
+    Returns:
+        Parsed data
+    """
+    sidecar_path = path + ".json"
+    source = [yaml_stat.st_mtime_ns, yaml_stat.st_size]
+
+    try:
+        with open(sidecar_path, 'r') as f:
+            sidecar = json.load(f)
+        if isinstance(sidecar, dict) and sidecar.get("source") == source:
+            return sidecar["data"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable sidecar {sidecar_path}: {e}")
+
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f)
+
+    try:
+        if json.loads(json.dumps(data)) != data:
+            raise ValueError("changed by JSON round trip")
+        serialized = json.dumps({"source": source, "data": data})
+        with open(sidecar_path, 'w') as f:
+            f.write(serialized)
+    except (TypeError, ValueError):
+        logger.debug(f"{path} contains values JSON cannot represent exactly, skipping sidecar")
+    except OSError as e:
+        logger.warning(f"Could not write sidecar {sidecar_path}: {e}")
+
+    return data